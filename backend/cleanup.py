@@ -1,57 +1,162 @@
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from itertools import chain, takewhile
+import json
 import os
 
+# S3 DeleteObjects accepts at most 1000 keys per request
+S3_DELETE_BATCH_SIZE = 1000
+
+# Thread pool sizing for the per-resource fan-out
+MAX_WORKERS = 16
+MAX_INFLIGHT_DELETES = 8
+
+# Connection pool sized for the thread pools above, with adaptive retries
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+
+def run_concurrently(func, items):
+    """⚡ Run func over items on a bounded thread pool, re-raising the first unexpected error
+
+    items may be a lazy iterable (e.g. over paginator pages), in which case
+    work is submitted while later pages are still being fetched.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(func, item) for item in items]
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in not_done:
+            future.cancel()
+        for future in done:
+            future.result()
+
 def delete_lambda_functions(lambda_client):
     """🗑️ Delete all Lambda functions starting with 'migration-planner-'"""
-    functions = lambda_client.list_functions()
-    for function in functions['Functions']:
-        if function['FunctionName'].startswith('migration-planner-'):
-            try:
-                lambda_client.delete_function(FunctionName=function['FunctionName'])
-                print(f"✅ Deleted Lambda function: {function['FunctionName']}")
-            except ClientError as e:
-                print(f"❌ Error deleting Lambda function {function['FunctionName']}: {str(e)}")
+    def delete_function(function_name):
+        try:
+            lambda_client.delete_function(FunctionName=function_name)
+            print(f"✅ Deleted Lambda function: {function_name}")
+        except ClientError as e:
+            print(f"❌ Error deleting Lambda function {function_name}: {str(e)}")
+
+    pages = lambda_client.get_paginator('list_functions').paginate(
+        PaginationConfig={'PageSize': 50}
+    )
+    run_concurrently(delete_function, (
+        function['FunctionName'] for page in pages for function in page['Functions']
+        if function['FunctionName'].startswith('migration-planner-')
+    ))
 
 def delete_api_gateways(apigateway_client):
     """🗑️ Delete all API Gateways starting with 'migration-planner-api'"""
-    apis = apigateway_client.get_apis()
-    for api in apis['Items']:
-        if api['Name'].startswith('migration-planner-api'):
-            try:
-                apigateway_client.delete_api(ApiId=api['ApiId'])
-                print(f"✅ Deleted API Gateway: {api['Name']}")
-            except ClientError as e:
-                print(f"❌ Error deleting API Gateway {api['Name']}: {str(e)}")
+    def delete_api(api):
+        try:
+            apigateway_client.delete_api(ApiId=api['ApiId'])
+            print(f"✅ Deleted API Gateway: {api['Name']}")
+        except ClientError as e:
+            print(f"❌ Error deleting API Gateway {api['Name']}: {str(e)}")
+
+    pages = apigateway_client.get_paginator('get_apis').paginate()
+    run_concurrently(delete_api, (
+        api for page in pages for api in page['Items']
+        if api['Name'].startswith('migration-planner-api')
+    ))
 
 def delete_dynamodb_tables(dynamodb_client):
     """🗑️ Delete all DynamoDB tables starting with 'migration-assessments-'"""
-    response = dynamodb_client.list_tables()
-    for table_name in response['TableNames']:
-        if table_name.startswith('migration-assessments-'):
-            try:
-                dynamodb_client.delete_table(TableName=table_name)
-                print(f"✅ Deleted DynamoDB table: {table_name}")
-            except ClientError as e:
-                print(f"❌ Error deleting DynamoDB table {table_name}: {str(e)}")
-
-def delete_s3_buckets(s3_client):
-    """🗑️ Delete all S3 buckets starting with 'migration-planner-data-'"""
+    def delete_table(table_name):
+        try:
+            dynamodb_client.delete_table(TableName=table_name)
+            print(f"✅ Deleted DynamoDB table: {table_name}")
+        except ClientError as e:
+            print(f"❌ Error deleting DynamoDB table {table_name}: {str(e)}")
+
+    # Table names are listed in ascending order, so start the listing at the
+    # prefix and stop as soon as a name no longer matches it
+    pages = dynamodb_client.get_paginator('list_tables').paginate(
+        ExclusiveStartTableName='migration-assessments-'
+    )
+    run_concurrently(delete_table, takewhile(
+        lambda table_name: table_name.startswith('migration-assessments-'),
+        (table_name for page in pages for table_name in page['TableNames'])
+    ))
+
+def delete_s3_buckets(s3_client, bucket_name=None):
+    """🗑️ Delete all S3 buckets starting with 'migration-planner-data-'
+
+    When the bucket name is already known (from infrastructure_details.json)
+    it is deleted directly and the account-wide list_buckets call is skipped.
+    """
+    def delete_bucket(bucket_name):
+        try:
+            # Delete all objects (and versions) in the bucket
+            empty_s3_bucket(s3_client, bucket_name)
+            
+            # Delete the bucket
+            s3_client.delete_bucket(Bucket=bucket_name)
+            print(f"✅ Deleted S3 bucket: {bucket_name}")
+        except ClientError as e:
+            print(f"❌ Error deleting S3 bucket {bucket_name}: {str(e)}")
+
+    if bucket_name:
+        delete_bucket(bucket_name)
+        return
+
     response = s3_client.list_buckets()
-    for bucket in response['Buckets']:
-        if bucket['Name'].startswith('migration-planner-data-'):
-            try:
-                # Delete all objects in the bucket
-                objects = s3_client.list_objects_v2(Bucket=bucket['Name'])
-                if 'Contents' in objects:
-                    delete_keys = {'Objects': [{'Key': obj['Key']} for obj in objects['Contents']]}
-                    s3_client.delete_objects(Bucket=bucket['Name'], Delete=delete_keys)
-                
-                # Delete the bucket
-                s3_client.delete_bucket(Bucket=bucket['Name'])
-                print(f"✅ Deleted S3 bucket: {bucket['Name']}")
-            except ClientError as e:
-                print(f"❌ Error deleting S3 bucket {bucket['Name']}: {str(e)}")
+    run_concurrently(delete_bucket, (
+        bucket['Name'] for bucket in response['Buckets']
+        if bucket['Name'].startswith('migration-planner-data-')
+    ))
+
+def iter_s3_object_identifiers(s3_client, bucket_name):
+    """📄 Stream the identifiers (with versions) of every object in a bucket, page by page"""
+    versioning = s3_client.get_bucket_versioning(Bucket=bucket_name)
+    if versioning.get('Status') in ('Enabled', 'Suspended'):
+        pages = s3_client.get_paginator('list_object_versions').paginate(Bucket=bucket_name)
+        for page in pages:
+            for version in chain(page.get('Versions', ()), page.get('DeleteMarkers', ())):
+                yield {'Key': version['Key'], 'VersionId': version['VersionId']}
+    else:
+        pages = s3_client.get_paginator('list_objects_v2').paginate(Bucket=bucket_name)
+        for page in pages:
+            for obj in page.get('Contents', ()):
+                yield {'Key': obj['Key']}
+
+def iter_s3_delete_batches(s3_client, bucket_name):
+    """📦 Group a bucket's object identifiers into DeleteObjects batches of at most 1000"""
+    batch = []
+    for identifier in iter_s3_object_identifiers(s3_client, bucket_name):
+        batch.append(identifier)
+        if len(batch) == S3_DELETE_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def empty_s3_bucket(s3_client, bucket_name):
+    """🧹 Delete every object, version and delete marker in a bucket
+
+    Listing runs on the calling thread while up to MAX_INFLIGHT_DELETES
+    DeleteObjects requests are in flight on a worker pool. Once that many
+    are pending, listing blocks on the oldest one, so memory stays bounded
+    by MAX_INFLIGHT_DELETES batches regardless of the bucket size.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_INFLIGHT_DELETES) as executor:
+        in_flight = deque()
+        for batch in iter_s3_delete_batches(s3_client, bucket_name):
+            if len(in_flight) >= MAX_INFLIGHT_DELETES:
+                in_flight.popleft().result()
+            in_flight.append(executor.submit(
+                s3_client.delete_objects,
+                Bucket=bucket_name,
+                Delete={'Objects': batch, 'Quiet': True}
+            ))
+        while in_flight:
+            in_flight.popleft().result()
 
 def delete_iam_roles(iam_client):
     """🗑️ Delete IAM role 'migration_planner_lambda_role'"""
@@ -73,6 +178,14 @@ def delete_iam_roles(iam_client):
     except ClientError as e:
         print(f"❌ Error deleting IAM role {role_name}: {str(e)}")
 
+def load_infrastructure_details():
+    """📄 Load the 'infrastructure_details.json' file written by infrastructure.py"""
+    try:
+        with open('infrastructure_details.json', 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
 def delete_infrastructure_file():
     """🗑️ Delete the 'infrastructure_details.json' file"""
     file_path = 'infrastructure_details.json'
@@ -89,18 +202,31 @@ def main():
     region = 'ap-south-1'  # 🌍 Replace with your region
     
     session = boto3.Session(region_name=region)
-    lambda_client = session.client('lambda')
-    apigateway_client = session.client('apigatewayv2') 
-    dynamodb_client = session.client('dynamodb')
-    s3_client = session.client('s3')
-    iam_client = session.client('iam')
+    lambda_client = session.client('lambda', config=AWS_CLIENT_CONFIG)
+    apigateway_client = session.client('apigatewayv2', config=AWS_CLIENT_CONFIG)
+    dynamodb_client = session.client('dynamodb', config=AWS_CLIENT_CONFIG)
+    s3_client = session.client('s3', config=AWS_CLIENT_CONFIG)
+    iam_client = session.client('iam', config=AWS_CLIENT_CONFIG)
     
     print("🚀 Starting cleanup...")
     
-    delete_lambda_functions(lambda_client)
-    delete_api_gateways(apigateway_client)
-    delete_dynamodb_tables(dynamodb_client)
-    delete_s3_buckets(s3_client)
+    infra_details = load_infrastructure_details()
+    
+    # The services are independent, so clean them up side by side. Each
+    # client has its own connection pool and is safe to call from a worker.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(delete_lambda_functions, lambda_client),
+            executor.submit(delete_api_gateways, apigateway_client),
+            executor.submit(delete_dynamodb_tables, dynamodb_client),
+            executor.submit(delete_s3_buckets, s3_client, infra_details.get('bucket_name'))
+        ]
+        wait(futures)
+    for future in futures:
+        if future.exception():
+            print(f"❌ Error during cleanup: {str(future.exception())}")
+    
+    # The IAM role is used by the Lambda functions, so remove it last
     delete_iam_roles(iam_client)
     delete_infrastructure_file()
     
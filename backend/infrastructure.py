@@ -1,9 +1,58 @@
+import base64
 import boto3
+import hashlib
+import io
 import json
 import time
 import zipfile
 import os
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+# Client config sized for the concurrent calls made through the shared executor
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+
+# CORS settings for the HTTP API, also carried into route re-imports
+API_CORS_CONFIGURATION = {
+    'AllowOrigins': ['*'],
+    'AllowMethods': ['POST', 'GET', 'OPTIONS'],
+    'AllowHeaders': ['content-type']
+}
+
+# Inline policy for the Lambda execution role
+LAMBDA_ROLE_POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Action": [
+                "s3:GetObject",
+                "s3:PutObject",
+                "s3:ListBucket"
+            ],
+            "Resource": ["arn:aws:s3:::*"]
+        },
+        {
+            "Effect": "Allow",
+            "Action": [
+                "dynamodb:PutItem",
+                "dynamodb:BatchWriteItem",
+                "dynamodb:GetItem",
+                "dynamodb:Query",
+                "dynamodb:UpdateItem"
+            ],
+            "Resource": ["arn:aws:dynamodb:*:*:table/*"]
+        }
+    ]
+}
+
+# Seconds to keep retrying Lambda calls while a new IAM role propagates
+ROLE_PROPAGATION_ATTEMPTS = 15
 
 def check_aws_credentials():
     """Check if AWS credentials are configured"""
@@ -14,27 +63,46 @@ def check_aws_credentials():
         return False
 
 class InfrastructureManager:
+    # Parsed infrastructure_details.json, shared by every manager in the process
+    _infrastructure_details = None
+
     def __init__(self, region='ap-south-1'):
         self.region = region
         print(f"Using AWS region: {self.region}")
         
-        # Initialize AWS clients with region
-        self.s3 = boto3.client('s3', region_name=self.region)
-        self.dynamodb = boto3.client('dynamodb', region_name=self.region)
-        self.lambda_client = boto3.client('lambda', region_name=self.region)
-        self.iam = boto3.client('iam', region_name=self.region)
-        self.apigateway = boto3.client('apigatewayv2', region_name=self.region)
+        # Initialize AWS clients from one shared session
+        self._session = boto3.session.Session(region_name=self.region)
+        self.s3 = self._session.client('s3', config=AWS_CLIENT_CONFIG)
+        self.dynamodb = self._session.client('dynamodb', config=AWS_CLIENT_CONFIG)
+        self.lambda_client = self._session.client('lambda', config=AWS_CLIENT_CONFIG)
+        self.iam = self._session.client('iam', config=AWS_CLIENT_CONFIG)
+        self.apigateway = self._session.client('apigatewayv2', config=AWS_CLIENT_CONFIG)
+        self.sts = self._session.client('sts', config=AWS_CLIENT_CONFIG)
+        self._account_id = None
+        self._new_table_name = None
+        
+        # Shared pool for overlapping independent AWS control-plane calls
+        self._executor = ThreadPoolExecutor(max_workers=8)
         
         # Load existing infrastructure details if available
         self.existing_infrastructure = self.load_existing_infrastructure()
 
     def load_existing_infrastructure(self):
-        """Load existing infrastructure details from file"""
-        try:
-            with open('infrastructure_details.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return None
+        """Load existing infrastructure details from file (parsed once per process)"""
+        if InfrastructureManager._infrastructure_details is None:
+            try:
+                with open('infrastructure_details.json', 'r') as f:
+                    InfrastructureManager._infrastructure_details = json.load(f)
+            except FileNotFoundError:
+                return None
+        return InfrastructureManager._infrastructure_details
+
+    @classmethod
+    def save_infrastructure_details(cls, infra_details):
+        """Save infrastructure details to file and refresh the cached copy"""
+        with open('infrastructure_details.json', 'w') as f:
+            json.dump(infra_details, f, indent=2)
+        cls._infrastructure_details = infra_details
 
     def resource_exists(self, resource_type, identifier):
         """Check if a resource already exists"""
@@ -48,13 +116,17 @@ class InfrastructureManager:
     def create_s3_bucket(self):
         """Create or get existing S3 bucket"""
         if self.existing_infrastructure and 'bucket_name' in self.existing_infrastructure:
-            try:
-                # Check if bucket exists
-                self.s3.head_bucket(Bucket=self.existing_infrastructure['bucket_name'])
-                print(f"\nUsing existing S3 bucket: {self.existing_infrastructure['bucket_name']}")
-                return self.existing_infrastructure['bucket_name']
-            except ClientError:
-                pass
+            bucket_name = self.existing_infrastructure['bucket_name']
+            print(f"\nUsing existing S3 bucket: {bucket_name}")
+            
+            # Check the bucket still exists off the critical path
+            self._executor.submit(
+                self._verify_existing_resource,
+                f"S3 bucket {bucket_name}",
+                self.s3.head_bucket,
+                Bucket=bucket_name
+            )
+            return bucket_name
 
         bucket_name = f"migration-planner-data-{int(time.time())}"
         print(f"\nCreating S3 bucket: {bucket_name}")
@@ -97,14 +169,25 @@ class InfrastructureManager:
             raise
 
     def create_dynamodb_table(self):
-        """Create or get existing DynamoDB table"""
+        """Create or get existing DynamoDB table and wait until it is ready"""
+        table_name = self._start_dynamodb_table()
+        self._await_dynamodb_table(table_name)
+        return table_name
+
+    def _start_dynamodb_table(self):
+        """Create or get existing DynamoDB table without waiting for it to be ready"""
         if self.existing_infrastructure and 'table_name' in self.existing_infrastructure:
-            try:
-                self.dynamodb.describe_table(TableName=self.existing_infrastructure['table_name'])
-                print(f"\nUsing existing DynamoDB table: {self.existing_infrastructure['table_name']}")
-                return self.existing_infrastructure['table_name']
-            except ClientError:
-                pass
+            table_name = self.existing_infrastructure['table_name']
+            print(f"\nUsing existing DynamoDB table: {table_name}")
+            
+            # Check the table still exists off the critical path
+            self._executor.submit(
+                self._verify_existing_resource,
+                f"DynamoDB table {table_name}",
+                self.dynamodb.describe_table,
+                TableName=table_name
+            )
+            return table_name
 
         table_name = f"migration-assessments-{int(time.time())}"
         print(f"\nCreating DynamoDB table: {table_name}")
@@ -123,15 +206,29 @@ class InfrastructureManager:
                 BillingMode='PAY_PER_REQUEST'
             )
             
-            print("Waiting for DynamoDB table to be ready...")
-            waiter = self.dynamodb.get_waiter('table_exists')
-            waiter.wait(TableName=table_name)
-            
+            self._new_table_name = table_name
             return table_name
         except Exception as e:
             print(f"Error creating DynamoDB table: {str(e)}")
             raise
 
+    def _await_dynamodb_table(self, table_name):
+        """Wait for a newly created DynamoDB table to be ready"""
+        if table_name != self._new_table_name:
+            return
+        
+        print("Waiting for DynamoDB table to be ready...")
+        waiter = self.dynamodb.get_waiter('table_exists')
+        waiter.wait(TableName=table_name)
+
+    def _verify_existing_resource(self, description, check, **kwargs):
+        """Warn if a resource recorded in infrastructure_details.json no longer exists"""
+        try:
+            check(**kwargs)
+        except ClientError as e:
+            print(f"\nWarning: {description} from infrastructure_details.json could not be verified: {str(e)}")
+            print("Delete infrastructure_details.json and run the setup again to recreate it.")
+
     def create_lambda_role(self):
         """Create or get existing IAM role"""
         role_name = "migration_planner_lambda_role"
@@ -140,6 +237,13 @@ class InfrastructureManager:
             # Try to get existing role
             response = self.iam.get_role(RoleName=role_name)
             print(f"\nUsing existing IAM role: {role_name}")
+            
+            # Keep the inline policy in step with what the handlers need
+            self.iam.put_role_policy(
+                RoleName=role_name,
+                PolicyName="migration_planner_policy",
+                PolicyDocument=json.dumps(LAMBDA_ROLE_POLICY)
+            )
             return response['Role']['Arn']
         except ClientError:
             print(f"\nCreating IAM role: {role_name}")
@@ -167,98 +271,106 @@ class InfrastructureManager:
                 )
                 
                 # Create custom policy
-                policy_document = {
-                    "Version": "2012-10-17",
-                    "Statement": [
-                        {
-                            "Effect": "Allow",
-                            "Action": [
-                                "s3:GetObject",
-                                "s3:PutObject",
-                                "s3:ListBucket"
-                            ],
-                            "Resource": ["arn:aws:s3:::*"]
-                        },
-                        {
-                            "Effect": "Allow",
-                            "Action": [
-                                "dynamodb:PutItem",
-                                "dynamodb:GetItem",
-                                "dynamodb:Query",
-                                "dynamodb:UpdateItem"
-                            ],
-                            "Resource": ["arn:aws:dynamodb:*:*:table/*"]
-                        }
-                    ]
-                }
-                
                 self.iam.put_role_policy(
                     RoleName=role_name,
                     PolicyName="migration_planner_policy",
-                    PolicyDocument=json.dumps(policy_document)
+                    PolicyDocument=json.dumps(LAMBDA_ROLE_POLICY)
                 )
                 
-                # Wait for role to be ready
+                # Wait for role to be ready. IAM keeps propagating after this,
+                # which _call_with_role_retry absorbs when the role is first used.
                 print("Waiting for IAM role to be ready...")
-                time.sleep(10)
+                self.iam.get_waiter('role_exists').wait(
+                    RoleName=role_name,
+                    WaiterConfig={'Delay': 1, 'MaxAttempts': 15}
+                )
                 
                 return response['Role']['Arn']
             except Exception as e:
                 print(f"Error creating IAM role: {str(e)}")
                 raise
 
-    def create_or_update_lambda_function(self, function_name, handler_file, role_arn, env_vars):
-        """Create or update a Lambda function"""
+    def _call_with_role_retry(self, api_call, **kwargs):
+        """Call a Lambda API, retrying while a newly created IAM role propagates"""
+        for attempt in range(ROLE_PROPAGATION_ATTEMPTS):
+            try:
+                return api_call(**kwargs)
+            except ClientError as e:
+                error = e.response['Error']
+                if error['Code'] != 'InvalidParameterValueException' or \
+                   'cannot be assumed' not in error.get('Message', '') or \
+                   attempt == ROLE_PROPAGATION_ATTEMPTS - 1:
+                    raise
+                time.sleep(1)
+
+    def create_or_update_lambda_function(self, function_name, handler_code, role_arn, env_vars):
+        """Create or update a Lambda function from the handler source bytes"""
         try:
-            # Create ZIP file
-            zip_path = f"/tmp/{function_name}.zip"
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                zipf.write(handler_file, "index.py")
+            # Create ZIP file in memory; the handler must be world-readable for Lambda
+            zip_info = zipfile.ZipInfo("index.py")
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+            zip_info.external_attr = 0o644 << 16
+            zip_buffer = io.BytesIO()
+            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                zipf.writestr(zip_info, handler_code)
+            zip_content = zip_buffer.getvalue()
             
-            with open(zip_path, 'rb') as f:
-                zip_content = f.read()
+            # The ZIP is deterministic, so its hash matches CodeSha256 when the code is unchanged
+            code_sha256 = base64.b64encode(hashlib.sha256(zip_content).digest()).decode()
+            function_config = {
+                'Runtime': 'python3.9',
+                'Role': role_arn,
+                'Handler': 'index.lambda_handler',
+                'Timeout': 30,
+                'MemorySize': 256,
+                'Environment': {'Variables': env_vars}
+            }
             
             try:
-                # Try to update existing function
+                configuration = self.lambda_client.get_function(FunctionName=function_name)['Configuration']
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                    raise
+                
+                # Create new function
+                response = self._call_with_role_retry(
+                    self.lambda_client.create_function,
+                    FunctionName=function_name,
+                    Code={'ZipFile': zip_content},
+                    **function_config
+                )
+                print(f"Created Lambda function: {function_name}")
+                return response['FunctionArn']
+            
+            code_changed = configuration['CodeSha256'] != code_sha256
+            config_changed = any(
+                configuration.get(key) != value
+                for key, value in function_config.items()
+                if key != 'Environment'
+            ) or configuration.get('Environment', {}).get('Variables', {}) != env_vars
+            
+            if code_changed:
                 self.lambda_client.update_function_code(
                     FunctionName=function_name,
                     ZipFile=zip_content
                 )
-                
-                self.lambda_client.update_function_configuration(
+            
+            if config_changed:
+                if code_changed:
+                    # Configuration updates are rejected while a code update is in progress
+                    self.lambda_client.get_waiter('function_updated').wait(FunctionName=function_name)
+                self._call_with_role_retry(
+                    self.lambda_client.update_function_configuration,
                     FunctionName=function_name,
-                    Runtime='python3.9',
-                    Role=role_arn,
-                    Handler='index.lambda_handler',
-                    Timeout=30,
-                    MemorySize=256,
-                    Environment={'Variables': env_vars}
+                    **function_config
                 )
-                print(f"Updated Lambda function: {function_name}")
-                
-            except ClientError as e:
-                if e.response['Error']['Code'] == 'ResourceNotFoundException':
-                    # Create new function
-                    self.lambda_client.create_function(
-                        FunctionName=function_name,
-                        Runtime='python3.9',
-                        Role=role_arn,
-                        Handler='index.lambda_handler',
-                        Code={'ZipFile': zip_content},
-                        Timeout=30,
-                        MemorySize=256,
-                        Environment={'Variables': env_vars}
-                    )
-                    print(f"Created Lambda function: {function_name}")
-                else:
-                    raise
             
-            # Clean up
-            os.remove(zip_path)
+            if code_changed or config_changed:
+                print(f"Updated Lambda function: {function_name}")
+            else:
+                print(f"Lambda function unchanged: {function_name}")
             
-            # Get function ARN
-            response = self.lambda_client.get_function(FunctionName=function_name)
-            return response['Configuration']['FunctionArn']
+            return configuration['FunctionArn']
             
         except Exception as e:
             print(f"Error with Lambda function {function_name}: {str(e)}")
@@ -274,24 +386,26 @@ class InfrastructureManager:
             'roadmapGenerator': 'roadmap_generator'
         }
         
-        lambda_functions = {}
+        env_vars = {
+            'DISCOVERY_TABLE': table_name
+        }
         
+        # Functions are independent, so deploy them concurrently
+        futures = {}
         for func_key, func_name in functions.items():
             function_name = f"migration-planner-{func_name}"
-            handler_file = f"lambda/{func_key}/index.py"
+            with open(f"lambda/{func_key}/index.py", 'rb') as f:
+                handler_code = f.read()
             
-            env_vars = {
-                'DISCOVERY_TABLE': table_name
-            }
-            
-            lambda_functions[func_key] = self.create_or_update_lambda_function(
+            futures[func_key] = self._executor.submit(
+                self.create_or_update_lambda_function,
                 function_name,
-                handler_file,
+                handler_code,
                 role_arn,
                 env_vars
             )
         
-        return lambda_functions
+        return {func_key: future.result() for func_key, future in futures.items()}
 
     def create_or_update_api_gateway(self, lambda_functions):
         """Create or update API Gateway"""
@@ -301,9 +415,9 @@ class InfrastructureManager:
         
         # Try to find existing API
         try:
-            apis = self.apigateway.get_apis()
+            pages = self.apigateway.get_paginator('get_apis').paginate()
             existing_api = next(
-                (api for api in apis['Items'] if api['Name'] == api_name),
+                (api for page in pages for api in page['Items'] if api['Name'] == api_name),
                 None
             )
             
@@ -324,11 +438,7 @@ class InfrastructureManager:
             api_response = self.apigateway.create_api(
                 Name=api_name,
                 ProtocolType='HTTP',
-                CorsConfiguration={
-                    'AllowOrigins': ['*'],
-                    'AllowMethods': ['POST', 'GET', 'OPTIONS'],
-                    'AllowHeaders': ['content-type']
-                }
+                CorsConfiguration=API_CORS_CONFIGURATION
             )
             
             api_id = api_response['ApiId']
@@ -358,50 +468,80 @@ class InfrastructureManager:
             'roadmap': lambda_functions['roadmapGenerator']
         }
         
-        for route_name, function_arn in routes.items():
-            # Create integration
-            integration = self.apigateway.create_integration(
+        # Push every route and integration in one OpenAPI import instead of
+        # separate create_integration / create_route calls per route
+        api_definition = {
+            'openapi': '3.0.1',
+            'info': {'title': 'migration-planner-api', 'version': '1.0'},
+            'x-amazon-apigateway-cors': {
+                'allowOrigins': API_CORS_CONFIGURATION['AllowOrigins'],
+                'allowMethods': API_CORS_CONFIGURATION['AllowMethods'],
+                'allowHeaders': API_CORS_CONFIGURATION['AllowHeaders']
+            },
+            'paths': {
+                f'/{route_name}': {
+                    'post': {
+                        'x-amazon-apigateway-integration': {
+                            'type': 'aws_proxy',
+                            'httpMethod': 'POST',
+                            'uri': function_arn,
+                            'payloadFormatVersion': '2.0'
+                        }
+                    }
+                }
+                for route_name, function_arn in routes.items()
+            }
+        }
+        
+        # The wildcard source ARN covers every stage and route, so each
+        # function needs a single permission regardless of its routes
+        source_arn = f'arn:aws:execute-api:{self.region}:{self.get_account_id()}:{api_id}/*/*'
+        
+        # The import and the permissions are independent, so run them concurrently
+        futures = [
+            self._executor.submit(
+                self.apigateway.reimport_api,
                 ApiId=api_id,
-                IntegrationType='AWS_PROXY',
-                IntegrationUri=function_arn,
-                PayloadFormatVersion='2.0',
-                IntegrationMethod='POST'
+                Body=json.dumps(api_definition)
             )
-            
-            # Create route
-            self.apigateway.create_route(
-                ApiId=api_id,
-                RouteKey=f"POST /{route_name}",
-                Target=f"integrations/{integration['IntegrationId']}"
+        ] + [
+            self._executor.submit(self._add_api_permission, func_key, function_arn, source_arn)
+            for func_key, function_arn in lambda_functions.items()
+        ]
+        for future in as_completed(futures):
+            future.result()
+
+    def _add_api_permission(self, func_key, function_arn, source_arn):
+        """Allow API Gateway to invoke a Lambda function"""
+        function_name = function_arn.split(':')[-1]
+        try:
+            self.lambda_client.add_permission(
+                FunctionName=function_name,
+                StatementId=f'ApiGateway-{func_key}',
+                Action='lambda:InvokeFunction',
+                Principal='apigateway.amazonaws.com',
+                SourceArn=source_arn
             )
-            
-            # Add Lambda permission
-            function_name = function_arn.split(':')[-1]
-            try:
-                self.lambda_client.add_permission(
-                    FunctionName=function_name,
-                    StatementId=f'ApiGateway-{route_name}',
-                    Action='lambda:InvokeFunction',
-                    Principal='apigateway.amazonaws.com',
-                    SourceArn=f'arn:aws:execute-api:{self.region}:{self.get_account_id()}:{api_id}/*/*'
-                )
-            except ClientError as e:
-                if e.response['Error']['Code'] != 'ResourceConflictException':
-                    raise
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ResourceConflictException':
+                raise
 
     def create_infrastructure(self):
         """Create or update infrastructure"""
         print("Starting infrastructure setup...")
         
         try:
-            # Create or get S3 bucket
-            bucket_name = self.create_s3_bucket()
+            # Create or get the S3 bucket, DynamoDB table and IAM role in parallel
+            bucket_future = self._executor.submit(self.create_s3_bucket)
+            table_future = self._executor.submit(self._start_dynamodb_table)
+            role_future = self._executor.submit(self.create_lambda_role)
             
-            # Create or get DynamoDB table
-            table_name = self.create_dynamodb_table()
+            bucket_name = bucket_future.result()
+            table_name = table_future.result()
+            role_arn = role_future.result()
             
-            # Create or get IAM role
-            role_arn = self.create_lambda_role()
+            # The Lambda functions are the first consumers of the table
+            self._await_dynamodb_table(table_name)
             
             # Create or update Lambda functions
             lambda_functions = self.create_lambda_functions(role_arn, table_name)
@@ -428,8 +568,10 @@ class InfrastructureManager:
             raise
 
     def get_account_id(self):
-        """Get AWS account ID"""
-        return boto3.client('sts').get_caller_identity()['Account']
+        """Get AWS account ID (cached after the first lookup)"""
+        if self._account_id is None:
+            self._account_id = self.sts.get_caller_identity()['Account']
+        return self._account_id
 
     def setup_environment_file(self, api_url):
         """Create or update .env file with API Gateway URL"""
@@ -446,21 +588,18 @@ class InfrastructureManager:
         }
 
         # Read existing .env if it exists
-        existing_env = {}
-        if os.path.exists(env_file_path):
-            with open(env_file_path, 'r') as f:
-                for line in f:
-                    if '=' in line:
-                        key, value = line.strip().split('=', 1)
-                        existing_env[key] = value
+        env_file = Path(env_file_path)
+        existing_env = dict(
+            line.strip().split('=', 1)
+            for line in env_file.read_text().splitlines()
+            if '=' in line
+        ) if env_file.exists() else {}
 
         # Update only new values, preserve existing ones
         existing_env.update(env_content)
 
-        # Write the updated content to .env file
-        with open(env_file_path, 'w') as f:
-            for key, value in existing_env.items():
-                f.write(f"{key}={value}\n")
+        # Write the updated content to .env file in a single write
+        env_file.write_text(''.join(f"{key}={value}\n" for key, value in existing_env.items()))
 
         print(f"\nEnvironment file updated: {env_file_path}")
         print("Note: Please manually add your AWS credentials to the .env file if needed:")
@@ -473,8 +612,10 @@ class InfrastructureManager:
             print("\nCleaning up old resources...")
             
             # List and delete old Lambda functions
-            functions = self.lambda_client.list_functions()
-            for function in functions['Functions']:
+            pages = self.lambda_client.get_paginator('list_functions').paginate(
+                PaginationConfig={'PageSize': 50}
+            )
+            for function in (f for page in pages for f in page['Functions']):
                 if function['FunctionName'].startswith('migration-planner-') and \
                    function['FunctionName'] not in [f"migration-planner-{name}" for name in ['discovery_processor', 'cost_estimator', 'roadmap_generator']]:
                     try:
@@ -484,8 +625,8 @@ class InfrastructureManager:
                         print(f"Error deleting Lambda function {function['FunctionName']}: {str(e)}")
 
             # List and delete old API Gateways
-            apis = self.apigateway.get_apis()
-            for api in apis['Items']:
+            pages = self.apigateway.get_paginator('get_apis').paginate()
+            for api in (a for page in pages for a in page['Items']):
                 if api['Name'].startswith('migration-planner-api-') and \
                    api['Name'] != 'migration-planner-api':
                     try:
@@ -497,10 +638,6 @@ class InfrastructureManager:
         except Exception as e:
             print(f"Error during cleanup: {str(e)}")
 
-    def get_account_id(self):
-        """Get AWS account ID"""
-        return boto3.client('sts').get_caller_identity()['Account']
-
 
 def check_aws_credentials():
     """Check if AWS credentials are configured"""
@@ -526,8 +663,7 @@ def main():
         infra_details = infra_manager.create_infrastructure()
         
         # Save infrastructure details to file
-        with open('infrastructure_details.json', 'w') as f:
-            json.dump(infra_details, f, indent=2)
+        InfrastructureManager.save_infrastructure_details(infra_details)
         
         # Setup environment file
         infra_manager.setup_environment_file(infra_details['api_url'])
@@ -1,16 +1,95 @@
 import json
 import boto3
+import math
 import os
 from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # orjson is only present when shipped in a Lambda layer
+    orjson = None
+
+def json_loads(data):
+    """Parse a JSON request body, using orjson when it is available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(obj):
+    """Serialize a response body to a JSON string, using orjson when it is available"""
+    if orjson:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, default=str)
+
+# Encode the fixed-shape success response from a template instead of the
+# generic JSON encoder; opt in per deployment
+TEMPLATE_RESPONSE_ENCODING = os.environ.get('TEMPLATE_RESPONSE_ENCODING') == 'true'
+
+# Response headers shared by every return path; never mutated
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
 
 # USD to INR conversion rate (you might want to make this dynamic)
 USD_TO_INR = 83.0
 
+@lru_cache(maxsize=256)
 def convert_to_inr(usd_amount):
     """Convert USD amount to INR"""
     return round(usd_amount * USD_TO_INR, 2)
 
+# EC2 prices in USD for the Mumbai region: (instance type, vCPUs, memory GB, hourly USD)
+INSTANCE_PRICING_USD = (
+    ('t3.micro', 2, 1, 0.0113),
+    ('t3.small', 2, 2, 0.0226),
+    ('t3.medium', 2, 4, 0.0452),
+    ('t3.large', 2, 8, 0.0904),
+    ('t3.xlarge', 4, 16, 0.1808),
+    ('t3.2xlarge', 8, 32, 0.3616),
+    ('c5.xlarge', 4, 8, 0.1890),
+    ('c5.2xlarge', 8, 16, 0.3780),
+    ('r5.xlarge', 4, 32, 0.2810),
+    ('r5.2xlarge', 8, 64, 0.5620)
+)
+
+# Same table converted to INR once per container and sorted cheapest first:
+# (instance type, vCPUs, memory GB, hourly INR, monthly INR)
+INSTANCE_PRICING_INR = tuple(sorted(
+    (
+        (instance_type, cpu, memory, convert_to_inr(hourly), convert_to_inr(hourly * 730))
+        for instance_type, cpu, memory, hourly in INSTANCE_PRICING_USD
+    ),
+    key=lambda instance: instance[3]
+))
+
+# Largest instance, used when no instance satisfies the requirements
+FALLBACK_INSTANCE = next(i for i in INSTANCE_PRICING_INR if i[0] == 'r5.2xlarge')
+
+# Reciprocal of 1024 * 1024; a power of two, so multiplying is exact
+GB_PER_KB = 1.0 / (1024 * 1024)
+
+# EBS pricing for Mumbai region, per GB-month in INR
+GP3_PRICE = convert_to_inr(0.0924)
+IO1_PRICE = convert_to_inr(0.1425)
+
+# Base migration costs in INR
+BASE_MIGRATION_COSTS = {
+    'Rehost': convert_to_inr(5000),      # Lift and shift
+    'Replatform': convert_to_inr(15000), # Partial optimization
+    'Refactor': convert_to_inr(30000)    # Full modernization
+}
+
+# Input validation rules: (metric, field, predicate, error message)
+VALIDATION_RULES = (
+    ('cpu', 'cores', lambda v: v > 0, "Invalid CPU cores value"),
+    ('cpu', 'utilization', lambda v: 0 <= v <= 100, "Invalid CPU utilization value"),
+    ('memory', 'total', lambda v: v > 0, "Invalid memory total value"),
+    ('memory', 'used', lambda v: v >= 0, "Invalid memory used value"),
+    ('storage', 'total', lambda v: v > 0, "Invalid storage total value"),
+    ('storage', 'used', lambda v: v >= 0, "Invalid storage used value")
+)
+
 def validate_input(server_data):
     """Validate server input data"""
     required_metrics = ['cpu', 'memory', 'storage']
@@ -23,87 +102,51 @@ def validate_input(server_data):
     for metric in required_metrics:
         if metric not in metrics:
             raise ValueError(f"Missing {metric} metrics")
-            
-    # Validate CPU metrics
-    cpu = metrics['cpu']
-    if not isinstance(cpu.get('cores'), (int, float)) or cpu['cores'] <= 0:
-        raise ValueError("Invalid CPU cores value")
-    if not isinstance(cpu.get('utilization'), (int, float)) or not 0 <= cpu['utilization'] <= 100:
-        raise ValueError("Invalid CPU utilization value")
-        
-    # Validate memory metrics
-    memory = metrics['memory']
-    if not isinstance(memory.get('total'), (int, float)) or memory['total'] <= 0:
-        raise ValueError("Invalid memory total value")
-    if not isinstance(memory.get('used'), (int, float)) or memory['used'] < 0:
-        raise ValueError("Invalid memory used value")
-        
-    # Validate storage metrics
-    storage = metrics['storage']
-    if not isinstance(storage.get('total'), (int, float)) or storage['total'] <= 0:
-        raise ValueError("Invalid storage total value")
-    if not isinstance(storage.get('used'), (int, float)) or storage['used'] < 0:
-        raise ValueError("Invalid storage used value")
+    
+    # Validate CPU, memory and storage values in a single pass
+    for metric, field, is_valid, message in VALIDATION_RULES:
+        value = metrics[metric].get(field)
+        if not isinstance(value, (int, float)) or not is_valid(value):
+            raise ValueError(message)
 
 def convert_to_gb(value_in_kb):
     """Convert KB to GB"""
-    return value_in_kb / (1024 * 1024)
+    return value_in_kb * GB_PER_KB
+
+@lru_cache(maxsize=1024)
+def select_instance(required_cpu, required_memory):
+    """Return the cheapest instance tuple with at least the required vCPUs and memory"""
+    # The table is sorted by price, so the first instance that fits is the cheapest
+    for instance in INSTANCE_PRICING_INR:
+        if instance[1] >= required_cpu and instance[2] >= required_memory:
+            return instance
+    return FALLBACK_INSTANCE
 
 def calculate_instance_costs(cpu_cores, memory_gb, utilization):
     """Calculate EC2 instance costs for ap-south-1 (Mumbai) region"""
-    # Prices in USD for Mumbai region
-    instance_pricing = {
-        't3.micro': {'cpu': 2, 'memory': 1, 'hourly': 0.0113},
-        't3.small': {'cpu': 2, 'memory': 2, 'hourly': 0.0226},
-        't3.medium': {'cpu': 2, 'memory': 4, 'hourly': 0.0452},
-        't3.large': {'cpu': 2, 'memory': 8, 'hourly': 0.0904},
-        't3.xlarge': {'cpu': 4, 'memory': 16, 'hourly': 0.1808},
-        't3.2xlarge': {'cpu': 8, 'memory': 32, 'hourly': 0.3616},
-        'c5.xlarge': {'cpu': 4, 'memory': 8, 'hourly': 0.1890},
-        'c5.2xlarge': {'cpu': 8, 'memory': 16, 'hourly': 0.3780},
-        'r5.xlarge': {'cpu': 4, 'memory': 32, 'hourly': 0.2810},
-        'r5.2xlarge': {'cpu': 8, 'memory': 64, 'hourly': 0.5620}
-    }
-
     # Add 20% buffer for growth
     required_cpu = max(1, cpu_cores * (utilization / 100) * 1.2)
     required_memory = max(1, memory_gb * 1.2)
 
-    suitable_instances = [
-        (instance_type, specs)
-        for instance_type, specs in instance_pricing.items()
-        if specs['cpu'] >= required_cpu and specs['memory'] >= required_memory
-    ]
-
-    if not suitable_instances:
-        instance_type = 'r5.2xlarge'
-        specs = instance_pricing['r5.2xlarge']
-    else:
-        instance_type, specs = min(suitable_instances, key=lambda x: x[1]['hourly'])
-
-    monthly_cost_usd = specs['hourly'] * 730
-    monthly_cost_inr = convert_to_inr(monthly_cost_usd)
+    # Instance sizes are whole vCPUs and GB, so rounding the requirements up
+    # selects exactly the same instance while letting similar servers share a cache entry
+    instance_type, cpu, memory, hourly_cost, monthly_cost = select_instance(
+        math.ceil(required_cpu),
+        math.ceil(required_memory)
+    )
 
     return {
         'instanceType': instance_type,
-        'monthlyCost': monthly_cost_inr,
+        'monthlyCost': monthly_cost,
         'specs': {
-            'cpu': specs['cpu'],
-            'memory': specs['memory'],
-            'hourlyCost': convert_to_inr(specs['hourly'])
+            'cpu': cpu,
+            'memory': memory,
+            'hourlyCost': hourly_cost
         }
     }
 
 def calculate_storage_costs(storage_gb):
     """Calculate storage costs in INR"""
-    # EBS pricing for Mumbai region (in USD)
-    GP3_PRICE_USD = 0.0924  # per GB-month
-    IO1_PRICE_USD = 0.1425  # per GB-month
-    
-    # Convert to INR
-    GP3_PRICE = convert_to_inr(GP3_PRICE_USD)
-    IO1_PRICE = convert_to_inr(IO1_PRICE_USD)
-    
     if storage_gb <= 1000:
         storage_cost = storage_gb * GP3_PRICE
         storage_type = 'gp3'
@@ -117,63 +160,85 @@ def calculate_storage_costs(storage_gb):
         'monthlyCost': round(storage_cost, 2)
     }
 
-def calculate_migration_costs(server_data):
-    """Calculate migration costs based on server complexity"""
-    # Base costs in INR
-    base_costs = {
-        'Rehost': convert_to_inr(5000),      # Lift and shift
-        'Replatform': convert_to_inr(15000), # Partial optimization
-        'Refactor': convert_to_inr(30000)    # Full modernization
-    }
-    
+def size_points(value, high, medium):
+    """Score a resource size: 3 points above high, 2 above medium, else 1"""
+    if value > high:
+        return 3
+    if value > medium:
+        return 2
+    return 1
+
+def calculate_migration_costs(server_data, memory_gb, storage_gb):
+    """Calculate migration costs based on server complexity
+
+    Takes the memory and storage sizes already converted to GB by the
+    handler, so the metrics are only read and converted once per request.
+    """
     strategy = server_data.get('migrationStrategy', 'Rehost')
-    base_cost = base_costs.get(strategy, base_costs['Rehost'])
-    
-    # Calculate complexity score
-    metrics = server_data['metrics']
-    complexity_score = 0
+    base_cost = BASE_MIGRATION_COSTS.get(strategy, BASE_MIGRATION_COSTS['Rehost'])
     
-    # CPU complexity
-    if metrics['cpu']['cores'] > 8:
-        complexity_score += 3
-    elif metrics['cpu']['cores'] > 4:
-        complexity_score += 2
-    else:
-        complexity_score += 1
+    # Calculate complexity score from CPU, memory and storage sizes
+    complexity_score = (
+        size_points(server_data['metrics']['cpu']['cores'], 8, 4) +
+        size_points(memory_gb, 64, 32) +
+        size_points(storage_gb, 1000, 500)
+    )
         
-    # Memory complexity
-    memory_gb = convert_to_gb(metrics['memory']['total'])
-    if memory_gb > 64:
-        complexity_score += 3
-    elif memory_gb > 32:
-        complexity_score += 2
-    else:
-        complexity_score += 1
-        
-    # Storage complexity
-    storage_gb = convert_to_gb(metrics['storage']['total'])
-    if storage_gb > 1000:
-        complexity_score += 3
-    elif storage_gb > 500:
-        complexity_score += 2
-    else:
-        complexity_score += 1
-        
-    # Adjust base cost by complexity
-    complexity_multiplier = 1 + (complexity_score / 10)
-    total_cost = base_cost * complexity_multiplier
+    base_cost, complexity_multiplier, total_cost = adjust_migration_cost(base_cost, complexity_score)
     
     return {
-        'baseCost': round(base_cost, 2),
+        'baseCost': base_cost,
         'complexityScore': complexity_score,
-        'complexityMultiplier': round(complexity_multiplier, 2),
-        'totalCost': round(total_cost, 2)
+        'complexityMultiplier': complexity_multiplier,
+        'totalCost': total_cost
     }
 
+@lru_cache(maxsize=64)
+def adjust_migration_cost(base_cost, complexity_score):
+    """Return rounded (base cost, complexity multiplier, total cost) for a complexity score"""
+    complexity_multiplier = 1 + (complexity_score / 10)
+    total_cost = base_cost * complexity_multiplier
+    return round(base_cost, 2), round(complexity_multiplier, 2), round(total_cost, 2)
+
+def encode_cost_response(response):
+    """Encode the success response with a fixed template, or None if it needs the generic encoder
+
+    Produces the same compact JSON as the generic encoder for finite values;
+    an infinite ROI (no savings) falls back, since JSON has no literal for it.
+    """
+    compute = response['recommendations']['compute']
+    specs = compute['specs']
+    storage = response['recommendations']['storage']
+    numbers = (
+        response['currentMonthlyCost'], response['projectedMonthlyCost'],
+        response['monthlySavings'], response['annualSavings'],
+        response['migrationCost'], response['roiMonths'],
+        compute['monthlyCost'], specs['hourlyCost'],
+        storage['sizeGB'], storage['monthlyCost'], response['threeYearSavings']
+    )
+    if not all(math.isfinite(number) for number in numbers):
+        return None
+
+    return (
+        f'{{"currency":"INR",'
+        f'"currentMonthlyCost":{response["currentMonthlyCost"]},'
+        f'"projectedMonthlyCost":{response["projectedMonthlyCost"]},'
+        f'"monthlySavings":{response["monthlySavings"]},'
+        f'"annualSavings":{response["annualSavings"]},'
+        f'"migrationCost":{response["migrationCost"]},'
+        f'"roiMonths":{response["roiMonths"]},'
+        f'"recommendations":{{'
+        f'"compute":{{"instanceType":"{compute["instanceType"]}",'
+        f'"monthlyCost":{compute["monthlyCost"]},'
+        f'"specs":{{"cpu":{specs["cpu"]},"memory":{specs["memory"]},"hourlyCost":{specs["hourlyCost"]}}}}},'
+        f'"storage":{{"type":"{storage["type"]}","sizeGB":{storage["sizeGB"]},"monthlyCost":{storage["monthlyCost"]}}}}},'
+        f'"threeYearSavings":{response["threeYearSavings"]}}}'
+    )
+
 def lambda_handler(event, context):
     try:
         # Parse input
-        body = json.loads(event.get('body', '{}'))
+        body = json_loads(event.get('body', '{}'))
         server_data = body.get('serverData')
         
         # Validate input
@@ -181,14 +246,15 @@ def lambda_handler(event, context):
         
         # Convert metrics to GB
         metrics = server_data['metrics']
+        cpu = metrics['cpu']
         memory_gb = convert_to_gb(metrics['memory']['total'])
         storage_gb = convert_to_gb(metrics['storage']['total'])
         
         # Calculate costs
         compute_costs = calculate_instance_costs(
-            metrics['cpu']['cores'],
+            cpu['cores'],
             memory_gb,
-            metrics['cpu']['utilization']
+            cpu['utilization']
         )
         
         storage_costs = calculate_storage_costs(storage_gb)
@@ -197,7 +263,7 @@ def lambda_handler(event, context):
         monthly_cloud_cost = compute_costs['monthlyCost'] + storage_costs['monthlyCost']
         
         # Calculate migration costs
-        migration_costs = calculate_migration_costs(server_data)
+        migration_costs = calculate_migration_costs(server_data, memory_gb, storage_gb)
         
         # Calculate ROI
         current_monthly_cost = monthly_cloud_cost * 1.4  # Assuming 40% savings
@@ -219,34 +285,27 @@ def lambda_handler(event, context):
             'threeYearSavings': round((monthly_savings * 36) - migration_costs['totalCost'], 2)
         }
         
+        body = encode_cost_response(response) if TEMPLATE_RESPONSE_ENCODING else None
+        
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps(response)
+            'headers': RESPONSE_HEADERS,
+            'body': body or json_dumps(response)
         }
         
     except ValueError as e:
         return {
             'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
+            'headers': RESPONSE_HEADERS,
+            'body': json_dumps({
                 'error': str(e)
             })
         }
     except Exception as e:
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
+            'headers': RESPONSE_HEADERS,
+            'body': json_dumps({
                 'error': f'Internal server error: {str(e)}'
             })
         }
\ No newline at end of file
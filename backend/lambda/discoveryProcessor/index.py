@@ -1,196 +1,495 @@
 import json
 import boto3
 import os
+import random
+import time
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from datetime import datetime
 from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 
-dynamodb = boto3.resource('dynamodb')
-s3 = boto3.client('s3')
-table = dynamodb.Table(os.environ['DISCOVERY_TABLE'])
+try:
+    import orjson
+except ImportError:  # orjson is only present when shipped in a Lambda layer
+    orjson = None
+
+# NumPy is imported lazily by load_numpy(); False once it is known to be missing
+np = None
+
+def json_loads(data):
+    """Parse a JSON request body, using orjson when it is available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(obj):
+    """Serialize a response body to a JSON string, using orjson when it is available"""
+    if orjson:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, default=str)
+
+# Response headers shared by every return path; never mutated
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+
+# Worker threads used to assess servers in parallel
+MAX_WORKERS = 16
+
+# BatchWriteItem accepts at most 25 put requests per call
+DYNAMODB_BATCH_SIZE = 25
+
+# Resends of UnprocessedItems back off exponentially, with full jitter, before
+# the remaining items are written one by one
+UNPROCESSED_MAX_ATTEMPTS = 8
+UNPROCESSED_BACKOFF_BASE = 0.05
+UNPROCESSED_BACKOFF_MAX = 2.0
+
+# Fleets at least this large are scored in one NumPy pass when NumPy is available;
+# smaller requests never import it, keeping cold starts on the pure Python path
+VECTORIZE_MIN_SERVERS = int(os.environ.get('VECTORIZE_MIN_SERVERS', '32'))
+
+# AWS resources are created once per container and reused by warm invocations;
+# the pool is sized above MAX_WORKERS so concurrent requests never queue for a connection
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+# Writes go through the low-level client with items serialized once by
+# TypeSerializer, skipping the resource layer's per-attribute marshalling
+dynamodb_client = boto3.client('dynamodb', config=AWS_CLIENT_CONFIG)
+TABLE_NAME = os.environ['DISCOVERY_TABLE']
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+def serialize_item(item):
+    """Serialize a plain item dict into DynamoDB attribute values"""
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+def put_items(items):
+    """Write serialized items one PutItem at a time, logging and skipping any that fail"""
+    for item in items:
+        try:
+            dynamodb_client.put_item(TableName=TABLE_NAME, Item=item)
+        except ClientError as e:
+            print(f"Error processing server {deserializer.deserialize(item['serverId'])}: {str(e)}")
+
+def batch_write_items(items):
+    """Write up to 25 serialized items with BatchWriteItem, resending unprocessed ones
+
+    Unprocessed items are resent with backoff. A single invalid item makes
+    DynamoDB reject the whole batch, so a failed batch, like items still
+    unprocessed after the last attempt, is written item by item instead.
+    """
+    request_items = {TABLE_NAME: [{'PutRequest': {'Item': item}} for item in items]}
+    for attempt in range(UNPROCESSED_MAX_ATTEMPTS):
+        if attempt:
+            time.sleep(random.uniform(0, min(UNPROCESSED_BACKOFF_MAX, UNPROCESSED_BACKOFF_BASE * 2 ** attempt)))
+        try:
+            response = dynamodb_client.batch_write_item(RequestItems=request_items)
+        except ClientError as e:
+            print(f"Batch write failed, writing items individually: {str(e)}")
+            break
+        request_items = response.get('UnprocessedItems')
+        if not request_items:
+            return
+    put_items([request['PutRequest']['Item'] for request in request_items[TABLE_NAME]])
 
 def float_to_decimal(obj):
-    """Convert float values to Decimal for DynamoDB"""
+    """Convert float values to Decimal for DynamoDB
+
+    Walks nested dicts and lists with an explicit work-list instead of
+    recursion, building converted copies so the input is left untouched.
+    Subtrees listed in FLOAT_FREE_IDS hold no floats and are shared as-is.
+    """
     if isinstance(obj, float):
         return Decimal(str(obj))
-    if isinstance(obj, dict):
-        return {k: float_to_decimal(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [float_to_decimal(x) for x in obj]
-    return obj
+    if not isinstance(obj, (dict, list)):
+        return obj
 
-def process_server_data(server_data):
-    """Process raw server data and extract relevant metrics"""
-    try:
-        # Convert memory to bytes if provided in other units
-        memory_total = server_data.get('totalMemory', 0)
-        memory_used = server_data.get('usedMemory', 0)
-        storage_total = server_data.get('totalStorage', 0)
-        storage_used = server_data.get('usedStorage', 0)
+    root = {} if isinstance(obj, dict) else [None] * len(obj)
+    stack = [(obj, root)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, value in items:
+            if isinstance(value, float):
+                value = Decimal(str(value))
+            elif id(value) in FLOAT_FREE_IDS:
+                pass
+            elif isinstance(value, dict):
+                converted = {}
+                stack.append((value, converted))
+                value = converted
+            elif isinstance(value, list):
+                converted = [None] * len(value)
+                stack.append((value, converted))
+                value = converted
+            target[key] = value
+    return root
+
+class ServerRecord:
+    """Flat, slotted view of one server's discovery data
+
+    Scoring reads plain attributes instead of walking nested dicts; the
+    nested layout is only built by to_dict() for the response and DynamoDB.
+    """
+    __slots__ = (
+        'server_id', 'server_name', 'cpu_cores', 'cpu_utilization',
+        'memory_total', 'memory_used', 'storage_total', 'storage_used',
+        'applications', 'dependencies', 'network_utilization'
+    )
+
+    def __init__(self, server_id, server_name, cpu_cores, cpu_utilization,
+                 memory_total, memory_used, storage_total, storage_used,
+                 applications, dependencies, network_utilization):
+        self.server_id = server_id
+        self.server_name = server_name
+        self.cpu_cores = cpu_cores
+        self.cpu_utilization = cpu_utilization
+        self.memory_total = memory_total
+        self.memory_used = memory_used
+        self.storage_total = storage_total
+        self.storage_used = storage_used
+        self.applications = applications
+        self.dependencies = dependencies
+        self.network_utilization = network_utilization
+
+    @property
+    def network_average_usage(self):
+        return self.network_utilization.get('averageUsage', 0)
 
+    def to_dict(self):
+        """Build the nested serverData dict stored and returned for the server"""
         return {
-            'serverId': server_data.get('serverId'),
-            'serverName': server_data.get('serverName'),
+            'serverId': self.server_id,
+            'serverName': self.server_name,
             'metrics': {
                 'cpu': {
-                    'cores': float_to_decimal(server_data.get('cpuCores', 0)),
-                    'utilization': float_to_decimal(server_data.get('cpuUtilization', 0))
+                    'cores': self.cpu_cores,
+                    'utilization': self.cpu_utilization
                 },
                 'memory': {
-                    'total': float_to_decimal(memory_total),
-                    'used': float_to_decimal(memory_used)
+                    'total': self.memory_total,
+                    'used': self.memory_used
                 },
                 'storage': {
-                    'total': float_to_decimal(storage_total),
-                    'used': float_to_decimal(storage_used)
+                    'total': self.storage_total,
+                    'used': self.storage_used
                 }
             },
-            'applications': server_data.get('applications', []),
-            'dependencies': server_data.get('dependencies', []),
-            'networkUtilization': float_to_decimal(server_data.get('networkUtilization', {}))
+            'applications': self.applications,
+            'dependencies': self.dependencies,
+            'networkUtilization': self.network_utilization
         }
+
+def process_server_data(server_data):
+    """Process raw server data and extract relevant metrics"""
+    try:
+        return ServerRecord(
+            server_data.get('serverId'),
+            server_data.get('serverName'),
+            server_data.get('cpuCores', 0),
+            server_data.get('cpuUtilization', 0),
+            server_data.get('totalMemory', 0),
+            server_data.get('usedMemory', 0),
+            server_data.get('totalStorage', 0),
+            server_data.get('usedStorage', 0),
+            server_data.get('applications', []),
+            server_data.get('dependencies', []),
+            server_data.get('networkUtilization', {})
+        )
     except Exception as e:
         raise ValueError(f"Error processing server data: {str(e)}")
 
-def calculate_migration_complexity(processed_data):
-    """Calculate migration complexity score"""
+def utilization_points(utilization):
+    """Score a utilization percentage: 3 points above 80%, 2 above 60%, else 1"""
+    if utilization > 80:
+        return 3
+    if utilization > 60:
+        return 2
+    return 1
+
+def complexity_score(cpu_utilization, memory_utilization, storage_utilization,
+                     num_dependencies, num_applications, network_util):
+    """Score migration complexity (6-18 points) from plain numeric inputs"""
+    return (
+        utilization_points(cpu_utilization) +
+        utilization_points(memory_utilization) +
+        utilization_points(storage_utilization) +
+        min(num_dependencies // 2, 3) +
+        min(num_applications // 2, 3) +
+        utilization_points(network_util)
+    )
+
+def calculate_migration_complexity(record):
+    """Calculate migration complexity score for a ServerRecord"""
     try:
-        complexity_score = 0
-        
-        # CPU utilization (0-3 points)
-        cpu_utilization = float(processed_data['metrics']['cpu']['utilization'])
-        if cpu_utilization > 80:
-            complexity_score += 3
-        elif cpu_utilization > 60:
-            complexity_score += 2
-        else:
-            complexity_score += 1
-
-        # Memory utilization (0-3 points)
-        memory_total = float(processed_data['metrics']['memory']['total'])
-        memory_used = float(processed_data['metrics']['memory']['used'])
-        memory_utilization = (memory_used / memory_total * 100) if memory_total > 0 else 0
-        if memory_utilization > 80:
-            complexity_score += 3
-        elif memory_utilization > 60:
-            complexity_score += 2
-        else:
-            complexity_score += 1
-
-        # Storage utilization (0-3 points)
-        storage_total = float(processed_data['metrics']['storage']['total'])
-        storage_used = float(processed_data['metrics']['storage']['used'])
-        storage_utilization = (storage_used / storage_total * 100) if storage_total > 0 else 0
-        if storage_utilization > 80:
-            complexity_score += 3
-        elif storage_utilization > 60:
-            complexity_score += 2
-        else:
-            complexity_score += 1
-
-        # Dependencies (0-3 points)
-        num_dependencies = len(processed_data['dependencies'])
-        complexity_score += min(num_dependencies // 2, 3)
-
-        # Applications (0-3 points)
-        num_applications = len(processed_data['applications'])
-        complexity_score += min(num_applications // 2, 3)
-
-        # Network utilization (0-3 points)
-        network_util = processed_data.get('networkUtilization', {}).get('averageUsage', 0)
-        if network_util > 80:
-            complexity_score += 3
-        elif network_util > 60:
-            complexity_score += 2
-        else:
-            complexity_score += 1
+        # CPU utilization; raw inputs may be numeric strings, so coerce them here
+        cpu_utilization = float(record.cpu_utilization)
 
-        # Calculate final complexity level
-        max_possible_score = 18
-        complexity_percentage = (complexity_score / max_possible_score) * 100
+        # Memory utilization
+        memory_total = float(record.memory_total)
+        memory_utilization = (float(record.memory_used) / memory_total * 100) if memory_total > 0 else 0
 
-        return {
-            'score': float_to_decimal(complexity_score),
-            'percentage': float_to_decimal(complexity_percentage),
-            'level': 'High' if complexity_percentage > 70 else 'Medium' if complexity_percentage > 40 else 'Low',
-            'factors': {
-                'cpu': float_to_decimal(cpu_utilization),
-                'memory': float_to_decimal(memory_utilization),
-                'storage': float_to_decimal(storage_utilization),
-                'dependencies': float_to_decimal(num_dependencies),
-                'applications': float_to_decimal(num_applications),
-                'network': float_to_decimal(network_util)
-            }
-        }
+        # Storage utilization
+        storage_total = float(record.storage_total)
+        storage_utilization = (float(record.storage_used) / storage_total * 100) if storage_total > 0 else 0
+
+        # Dependencies and applications
+        num_dependencies = len(record.dependencies)
+        num_applications = len(record.applications)
+
+        # Network utilization
+        network_util = record.network_average_usage
+
+        score = complexity_score(
+            cpu_utilization, memory_utilization, storage_utilization,
+            num_dependencies, num_applications, network_util
+        )
+
+        return build_complexity(
+            score, cpu_utilization, memory_utilization, storage_utilization,
+            num_dependencies, num_applications, network_util
+        )
     except Exception as e:
         raise ValueError(f"Error calculating complexity: {str(e)}")
 
-def suggest_migration_strategy(processed_data, complexity):
-    """Suggest migration strategy based on complexity"""
-    if complexity['level'] == 'Low':
-        return {
-            'strategy': 'Rehost',
-            'description': 'Lift-and-shift migration recommended due to low complexity and minimal dependencies.',
-            'estimated_timeline': '2-4 weeks',
-            'confidence_level': 'High',
-            'risk_level': 'Low',
-            'aws_services': [
-                'AWS Application Migration Service',
-                'EC2',
-                'EBS',
-                'VPC'
-            ],
-            'key_considerations': [
-                'Minimal application changes required',
-                'Quick migration timeline',
-                'Lower initial costs',
-                'Good for meeting tight deadlines'
-            ]
-        }
-    elif complexity['level'] == 'Medium':
-        return {
-            'strategy': 'Replatform',
-            'description': 'Modify and optimize applications during migration for better cloud-native compatibility.',
-            'estimated_timeline': '1-3 months',
-            'confidence_level': 'Medium',
-            'risk_level': 'Medium',
-            'aws_services': [
-                'AWS Application Migration Service',
-                'EC2',
-                'RDS',
-                'ECS',
-                'Auto Scaling',
-                'Elastic Load Balancing'
-            ],
-            'key_considerations': [
-                'Moderate application modifications needed',
-                'Balance between modernization and speed',
-                'Improved cloud optimization',
-                'Better scalability options'
-            ]
-        }
-    else:
-        return {
-            'strategy': 'Refactor',
-            'description': 'Significant re-architecture recommended to fully leverage cloud-native capabilities.',
-            'estimated_timeline': '3-6 months',
-            'confidence_level': 'Medium',
-            'risk_level': 'High',
-            'aws_services': [
-                'ECS',
-                'EKS',
-                'Lambda',
-                'RDS',
-                'DynamoDB',
-                'API Gateway',
-                'CloudFront'
-            ],
-            'key_considerations': [
-                'Major application redesign required',
-                'Highest long-term benefits',
-                'Full cloud-native capabilities',
-                'Improved performance and scalability'
-            ]
+def build_complexity(score, cpu_utilization, memory_utilization, storage_utilization,
+                     num_dependencies, num_applications, network_util):
+    """Build the complexity summary for a score and the factors behind it"""
+    # Calculate final complexity level
+    max_possible_score = 18
+    complexity_percentage = (score / max_possible_score) * 100
+
+    return {
+        'score': score,
+        'percentage': complexity_percentage,
+        'level': 'High' if complexity_percentage > 70 else 'Medium' if complexity_percentage > 40 else 'Low',
+        'factors': {
+            'cpu': cpu_utilization,
+            'memory': memory_utilization,
+            'storage': storage_utilization,
+            'dependencies': num_dependencies,
+            'applications': num_applications,
+            'network': network_util
         }
+    }
+
+def utilization_points_array(utilization):
+    """Vectorized utilization_points over a NumPy array of percentages"""
+    return np.where(utilization > 80, 3, np.where(utilization > 60, 2, 1))
+
+def percent_used_array(used, total):
+    """Vectorized used / total * 100, with 0 where the total is not positive"""
+    return np.divide(used, total, out=np.zeros_like(used), where=total > 0) * 100
+
+def calculate_fleet_complexity(records):
+    """Calculate migration complexity for many ServerRecords in one vectorized pass"""
+    def column(values):
+        return np.fromiter(values, dtype=np.float64, count=len(records))
+
+    memory_total = column(r.memory_total for r in records)
+    storage_total = column(r.storage_total for r in records)
+    cpu_util = column(r.cpu_utilization for r in records)
+    memory_util = percent_used_array(column(r.memory_used for r in records), memory_total)
+    storage_util = percent_used_array(column(r.storage_used for r in records), storage_total)
+    network_util = [r.network_average_usage for r in records]
+    num_dependencies = [len(r.dependencies) for r in records]
+    num_applications = [len(r.applications) for r in records]
+
+    scores = (
+        utilization_points_array(cpu_util) +
+        utilization_points_array(memory_util) +
+        utilization_points_array(storage_util) +
+        np.minimum(column(num_dependencies) // 2, 3).astype(np.int64) +
+        np.minimum(column(num_applications) // 2, 3).astype(np.int64) +
+        utilization_points_array(column(network_util))
+    ).tolist()
+
+    # Factors keep the scalar path's types: floats, and 0 for an empty total
+    memory_util = memory_util.tolist()
+    storage_util = storage_util.tolist()
+    return [
+        build_complexity(
+            score,
+            float(record.cpu_utilization),
+            memory if record.memory_total > 0 else 0,
+            storage if record.storage_total > 0 else 0,
+            dependencies,
+            applications,
+            network
+        )
+        for record, score, memory, storage, dependencies, applications, network in zip(
+            records, scores, memory_util, storage_util,
+            num_dependencies, num_applications, network_util
+        )
+    ]
+
+# Migration strategy recommendations by complexity level. These are shared
+# between calls, so treat the returned dicts as read-only.
+MIGRATION_STRATEGIES = {
+    'Low': {
+        'strategy': 'Rehost',
+        'description': 'Lift-and-shift migration recommended due to low complexity and minimal dependencies.',
+        'estimated_timeline': '2-4 weeks',
+        'confidence_level': 'High',
+        'risk_level': 'Low',
+        'aws_services': [
+            'AWS Application Migration Service',
+            'EC2',
+            'EBS',
+            'VPC'
+        ],
+        'key_considerations': [
+            'Minimal application changes required',
+            'Quick migration timeline',
+            'Lower initial costs',
+            'Good for meeting tight deadlines'
+        ]
+    },
+    'Medium': {
+        'strategy': 'Replatform',
+        'description': 'Modify and optimize applications during migration for better cloud-native compatibility.',
+        'estimated_timeline': '1-3 months',
+        'confidence_level': 'Medium',
+        'risk_level': 'Medium',
+        'aws_services': [
+            'AWS Application Migration Service',
+            'EC2',
+            'RDS',
+            'ECS',
+            'Auto Scaling',
+            'Elastic Load Balancing'
+        ],
+        'key_considerations': [
+            'Moderate application modifications needed',
+            'Balance between modernization and speed',
+            'Improved cloud optimization',
+            'Better scalability options'
+        ]
+    },
+    'High': {
+        'strategy': 'Refactor',
+        'description': 'Significant re-architecture recommended to fully leverage cloud-native capabilities.',
+        'estimated_timeline': '3-6 months',
+        'confidence_level': 'Medium',
+        'risk_level': 'High',
+        'aws_services': [
+            'ECS',
+            'EKS',
+            'Lambda',
+            'RDS',
+            'DynamoDB',
+            'API Gateway',
+            'CloudFront'
+        ],
+        'key_considerations': [
+            'Major application redesign required',
+            'Highest long-term benefits',
+            'Full cloud-native capabilities',
+            'Improved performance and scalability'
+        ]
+    }
+}
+
+# The strategy dicts never contain floats, so float_to_decimal can skip walking them
+FLOAT_FREE_IDS = frozenset(id(strategy) for strategy in MIGRATION_STRATEGIES.values())
+
+def suggest_migration_strategy(record, complexity):
+    """Suggest migration strategy based on complexity"""
+    return MIGRATION_STRATEGIES.get(complexity['level'], MIGRATION_STRATEGIES['High'])
+
+def build_assessment(record, complexity):
+    """Combine the server's data, complexity and suggested strategy into an assessment"""
+    return {
+        'timestamp': datetime.utcnow().isoformat(),
+        'serverData': record.to_dict(),
+        'complexity': complexity,
+        'migrationStrategy': suggest_migration_strategy(record, complexity)
+    }
+
+def assess_server(server):
+    """Build the full assessment for one server, or None if it cannot be processed"""
+    try:
+        # Process raw server data
+        record = process_server_data(server)
+        
+        # Calculate migration complexity
+        complexity = calculate_migration_complexity(record)
+        
+        # Generate migration strategy and combine all information
+        return build_assessment(record, complexity)
+    except Exception as e:
+        print(f"Error processing server {server.get('serverId', 'unknown')}: {str(e)}")
+        return None
+
+def is_plain_number(value):
+    """True for int and float values; bools and numeric strings are not plain numbers"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def has_plain_metrics(record):
+    """True when every metric the vectorized path reads is a plain number
+
+    NumPy would silently turn None into NaN and parse numeric strings, so
+    anything else is left to calculate_migration_complexity to coerce or reject.
+    """
+    try:
+        network_util = record.network_average_usage
+    except AttributeError:
+        return False
+    return all(map(is_plain_number, (
+        record.cpu_utilization, record.memory_total, record.memory_used,
+        record.storage_total, record.storage_used, network_util
+    )))
+
+def assess_fleet(servers):
+    """Assess a large fleet with vectorized scoring, skipping servers that cannot be processed"""
+    processed = []
+    for server in servers:
+        try:
+            record = process_server_data(server)
+            processed.append((server, record, has_plain_metrics(record)))
+        except Exception as e:
+            print(f"Error processing server {server.get('serverId', 'unknown')}: {str(e)}")
+
+    fleet_complexities = iter(calculate_fleet_complexity(
+        [record for _, record, vectorized in processed if vectorized]
+    ))
+    assessments = []
+    for server, record, vectorized in processed:
+        if vectorized:
+            complexity = next(fleet_complexities)
+        else:
+            try:
+                complexity = calculate_migration_complexity(record)
+            except Exception as e:
+                print(f"Error processing server {server.get('serverId', 'unknown')}: {str(e)}")
+                continue
+        assessments.append(build_assessment(record, complexity))
+    return assessments
+
+def load_numpy():
+    """Import NumPy on first use, returning None when it is not installed"""
+    global np
+    if np is None:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:  # NumPy is only present when shipped in a Lambda layer
+            np = False
+    return np or None
+
+def assess_servers(servers, executor):
+    """Assess every server, vectorizing the scoring for large fleets when NumPy is available"""
+    if len(servers) >= VECTORIZE_MIN_SERVERS and load_numpy() is not None:
+        try:
+            return assess_fleet(servers)
+        except Exception as e:
+            # Malformed metrics somewhere in the fleet; score server by server instead
+            print(f"Falling back to per-server assessment: {str(e)}")
+    return executor.map(assess_server, servers)
 
 def lambda_handler(event, context):
     try:
@@ -198,66 +497,60 @@ def lambda_handler(event, context):
         if not event.get('body'):
             raise ValueError("Missing request body")
 
-        discovery_data = json.loads(event['body'])
+        discovery_data = json_loads(event['body'])
         
         if not discovery_data.get('servers'):
             raise ValueError("No server data provided")
         
-        # Process each server's data
+        # Process servers on a worker pool while this thread is the single
+        # writer, flushing 25 items per BatchWriteItem request. Pending items
+        # are keyed by primary key, since a batch may not repeat a key.
         processed_servers = []
-        for server in discovery_data['servers']:
-            try:
-                # Process raw server data
-                processed_data = process_server_data(server)
-                
-                # Calculate migration complexity
-                complexity = calculate_migration_complexity(processed_data)
-                
-                # Generate migration strategy
-                strategy = suggest_migration_strategy(processed_data, complexity)
-                
-                # Combine all information
-                server_assessment = {
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'serverData': processed_data,
-                    'complexity': complexity,
-                    'migrationStrategy': strategy
-                }
+        pending = {}
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for server_assessment in assess_servers(discovery_data['servers'], executor):
+                if server_assessment is None:
+                    continue
                 
                 processed_servers.append(server_assessment)
                 
-                # Store in DynamoDB
-                table.put_item(Item={
-                    'serverId': processed_data['serverId'],
-                    'timestamp': server_assessment['timestamp'],
-                    'assessment': float_to_decimal(server_assessment)
-                })
-                
-            except Exception as e:
-                print(f"Error processing server {server.get('serverId', 'unknown')}: {str(e)}")
-                continue
+                # Store in DynamoDB; floats are only converted to Decimal here.
+                # An item that cannot be stored is logged and left out of the
+                # batch, so it never fails the writes of other servers.
+                server_id = server_assessment['serverData']['serverId']
+                try:
+                    if not isinstance(server_id, str) or not server_id:
+                        raise ValueError("serverId must be a non-empty string")
+                    key = (server_id, server_assessment['timestamp'])
+                    pending[key] = serialize_item({
+                        'serverId': server_id,
+                        'timestamp': key[1],
+                        'assessment': float_to_decimal(server_assessment)
+                    })
+                except Exception as e:
+                    print(f"Error processing server {server_id}: {str(e)}")
+                    continue
+                if len(pending) == DYNAMODB_BATCH_SIZE:
+                    batch_write_items(list(pending.values()))
+                    pending = {}
+        if pending:
+            batch_write_items(list(pending.values()))
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': json_dumps({
                 'message': 'Successfully processed discovery data',
                 'servers': processed_servers
-            }, default=str),
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            }
+            }),
+            'headers': RESPONSE_HEADERS
         }
         
     except Exception as e:
         print(f"Error in lambda_handler: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': json_dumps({
                 'error': str(e)
             }),
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            }
+            'headers': RESPONSE_HEADERS
         }
\ No newline at end of file
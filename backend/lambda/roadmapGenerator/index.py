@@ -1,442 +1,618 @@
 import json
 import boto3
 import os
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is only present when shipped in a Lambda layer
+    orjson = None
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON request body, using orjson when it is available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(obj: Any) -> str:
+    """Serialize a response body to a JSON string, using orjson when it is available"""
+    if orjson:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, default=str)
+
+# Known strategies and complexity levels are mapped to small integer IDs once,
+# so per-strategy and per-level tables are tuples indexed by ID. Each table has
+# one extra trailing entry used for any other (unknown) value.
+STRATEGIES = ('Rehost', 'Replatform', 'Refactor')
+STRATEGY_IDS = {strategy: index for index, strategy in enumerate(STRATEGIES)}
+OTHER_STRATEGY = len(STRATEGIES)
+
+COMPLEXITY_LEVELS = ('Low', 'Medium', 'High')
+LEVEL_IDS = {level: index for index, level in enumerate(COMPLEXITY_LEVELS)}
+OTHER_LEVEL = len(COMPLEXITY_LEVELS)
+HIGH_LEVEL = LEVEL_IDS['High']
+
+class RoadmapServer:
+    """Flat, slotted view of the fields the roadmap reads from one server assessment
+
+    Built once per server, so the scoring, duration, effort and risk helpers
+    read plain attributes instead of descending the nested assessment dicts.
+    """
+    __slots__ = (
+        'server_id', 'server_name', 'dependencies', 'dependency_count',
+        'strategy', 'strategy_id', 'risk_level', 'complexity_level', 'level_id', 'complexity_score',
+        'cpu_utilization', 'memory_used', 'memory_total', 'storage_used', 'storage_total'
+    )
 
-def generate_timeline(servers, start_date=None):
+    def __init__(self, server: dict):
+        server_data = server['serverData']
+        metrics = server_data['metrics']
+        self.server_id = server_data['serverId']
+        self.server_name = server_data['serverName']
+        self.dependencies = server_data['dependencies']
+        self.dependency_count = len(self.dependencies)
+        self.strategy = server['migrationStrategy']['strategy']
+        self.strategy_id = STRATEGY_IDS.get(self.strategy, OTHER_STRATEGY)
+        self.risk_level = server['migrationStrategy']['risk_level']
+        self.complexity_level = server['complexity']['level']
+        self.level_id = LEVEL_IDS.get(self.complexity_level, OTHER_LEVEL)
+        self.complexity_score = server['complexity']['score']
+        self.cpu_utilization = metrics['cpu']['utilization']
+        self.memory_used = metrics['memory']['used']
+        self.memory_total = metrics['memory']['total']
+        self.storage_used = metrics['storage']['used']
+        self.storage_total = metrics['storage']['total']
+
+def generate_timeline(servers: List[dict], start_date: Optional[datetime] = None) -> List[dict]:
     """Generate detailed migration timeline"""
     if not start_date:
         start_date = datetime.now()
 
+    timeline, _ = schedule_timeline(servers, start_date)
+    return timeline
+
+def schedule_timeline(servers: List[dict], start_date: datetime) -> Tuple[List[dict], datetime]:
+    """Generate the migration timeline along with the end datetime of its last migration"""
     # Sort servers by complexity and dependencies
-    sorted_servers = sort_servers_by_priority(servers)
+    sorted_servers = sort_servers_by_priority([RoadmapServer(server) for server in servers])
+    dependent_counts = count_dependents(sorted_servers)
     timeline = []
     current_date = start_date
+    end_date = start_date
 
     for server in sorted_servers:
         # Calculate duration based on strategy and complexity
         duration = calculate_phase_duration(server)
+        end_date = current_date + duration
         
         # Generate phases
-        phases = generate_detailed_phases(server, current_date)
+        phases = generate_detailed_phases(server, current_date, duration)
         
         timeline_entry = {
-            'serverId': server['serverData']['serverId'],
-            'serverName': server['serverData']['serverName'],
-            'startDate': current_date.strftime('%Y-%m-%d'),
-            'endDate': (current_date + duration).strftime('%Y-%m-%d'),
+            'serverId': server.server_id,
+            'serverName': server.server_name,
+            'startDate': current_date.date().isoformat(),
+            'endDate': end_date.date().isoformat(),
             'duration': f"{duration.days} days",
-            'strategy': server['migrationStrategy']['strategy'],
-            'complexity': server['complexity']['level'],
+            'strategy': server.strategy,
+            'complexity': server.complexity_level,
             'phases': phases,
-            'riskLevel': server['migrationStrategy']['risk_level'],
-            'dependencies': server['serverData']['dependencies'],
+            'riskLevel': server.risk_level,
+            'dependencies': server.dependencies,
             'estimatedEffort': calculate_effort(server),
-            'criticalPath': is_critical_path(server, sorted_servers)
+            'criticalPath': is_critical_path(server, dependent_counts)
         }
         
         timeline.append(timeline_entry)
-        current_date += duration + timedelta(weeks=1)  # 1 week buffer between servers
+        current_date = end_date + timedelta(weeks=1)  # 1 week buffer between servers
 
-    return timeline
+    return timeline, end_date
 
-def sort_servers_by_priority(servers):
+def sort_servers_by_priority(servers: List[RoadmapServer]) -> List[RoadmapServer]:
     """Sort servers based on complexity, dependencies, and criticality"""
     # Create dependency graph
     dependency_graph = {}
     for server in servers:
-        server_id = server['serverData']['serverId']
-        dependency_graph[server_id] = {
+        dependency_graph[server.server_id] = {
             'server': server,
-            'dependencies': server['serverData']['dependencies'],
+            'dependencies': server.dependencies,
             'complexity_score': calculate_complexity_score(server)
         }
 
-    # Calculate priority scores
+    # Calculate priority scores once per server
+    priorities = calculate_priority_scores(dependency_graph)
     for server_id in dependency_graph:
-        dependency_graph[server_id]['priority'] = calculate_priority_score(
-            server_id, 
-            dependency_graph
-        )
+        dependency_graph[server_id]['priority'] = priorities[server_id]
 
     # Sort based on priority and complexity
     sorted_servers = sorted(
         servers,
         key=lambda s: (
-            calculate_priority_score(s['serverData']['serverId'], dependency_graph),
-            -calculate_complexity_score(s)  # Negative for descending order
+            priorities[s.server_id],
+            -dependency_graph[s.server_id]['complexity_score']  # Negative for descending order
         )
     )
 
     return sorted_servers
 
-def calculate_complexity_score(server):
+def calculate_complexity_score(server: RoadmapServer) -> float:
     """Calculate numerical complexity score"""
-    base_score = server['complexity']['score']
+    base_score = server.complexity_score
     
     # Add weight for number of dependencies
-    dependency_score = len(server['serverData']['dependencies']) * 2
+    dependency_score = server.dependency_count * 2
     
     # Add weight for resource utilization
     utilization_score = (
-        server['serverData']['metrics']['cpu']['utilization'] +
-        (server['serverData']['metrics']['memory']['used'] / 
-         server['serverData']['metrics']['memory']['total'] * 100) +
-        (server['serverData']['metrics']['storage']['used'] / 
-         server['serverData']['metrics']['storage']['total'] * 100)
+        server.cpu_utilization +
+        (server.memory_used / server.memory_total * 100) +
+        (server.storage_used / server.storage_total * 100)
     ) / 3
 
     return base_score + dependency_score + (utilization_score * 0.5)
 
-def calculate_priority_score(server_id, dependency_graph, visited=None):
-    """Calculate priority score based on dependencies"""
-    if visited is None:
-        visited = set()
-
-    if server_id in visited:
-        return 0
+def calculate_priority_score(server_id: str, dependency_graph: Dict[str, dict]) -> float:
+    """Calculate priority score based on dependencies
 
-    visited.add(server_id)
+    Walks the dependencies depth first with an explicit stack rather than
+    recursion, so long dependency chains cannot exceed the recursion limit.
+    Each server reached is counted once.
+    """
+    visited = {server_id}
     server_node = dependency_graph.get(server_id, {})
-    
-    # Base priority from complexity
-    priority = server_node.get('complexity_score', 0)
-    
-    # Add scores from dependent servers
-    for dep_id in server_node.get('dependencies', []):
-        if dep_id in dependency_graph:
-            priority += calculate_priority_score(dep_id, dependency_graph, visited)
-
-    return priority
 
-def calculate_phase_duration(server):
+    # Each frame holds the running priority of a server (starting from its
+    # complexity) and an iterator over the dependencies still to visit
+    stack = [[server_node.get('complexity_score', 0), iter(server_node.get('dependencies', []))]]
+    while True:
+        frame = stack[-1]
+        for dep_id in frame[1]:
+            if dep_id in dependency_graph and dep_id not in visited:
+                visited.add(dep_id)
+                dep_node = dependency_graph[dep_id]
+                stack.append([dep_node['complexity_score'], iter(dep_node['dependencies'])])
+                break
+        else:
+            # All dependencies visited; add this server's total to its dependent's
+            stack.pop()
+            if not stack:
+                return frame[0]
+            stack[-1][0] += frame[0]
+
+def calculate_priority_scores(dependency_graph: Dict[str, dict]) -> Dict[str, float]:
+    """Calculate the priority score of every server in one pass over the dependency graph
+
+    A server's priority is the complexity of the server plus that of everything
+    it transitively depends on, each counted once. Servers are visited
+    dependencies first (Kahn's algorithm), so the set of servers each one
+    reaches is the union of its dependencies' sets, kept as a bitmask. Servers
+    on or behind a dependency cycle have no such order and fall back to
+    calculate_priority_score.
+    """
+    server_ids = list(dependency_graph)
+    complexity_scores = [dependency_graph[server_id]['complexity_score'] for server_id in server_ids]
+    bits = {server_id: 1 << index for index, server_id in enumerate(server_ids)}
+
+    # Count each server's unresolved dependencies and record who depends on it
+    unresolved = {}
+    dependents = defaultdict(list)
+    for server_id, node in dependency_graph.items():
+        dependencies = {dep_id for dep_id in node['dependencies'] if dep_id in dependency_graph}
+        unresolved[server_id] = len(dependencies)
+        for dep_id in dependencies:
+            dependents[dep_id].append(server_id)
+
+    reachable = {}
+    ready = deque(server_id for server_id, count in unresolved.items() if count == 0)
+    while ready:
+        server_id = ready.popleft()
+        mask = bits[server_id]
+        for dep_id in dependency_graph[server_id]['dependencies']:
+            mask |= reachable.get(dep_id, 0)
+        reachable[server_id] = mask
+
+        for dependent_id in dependents[server_id]:
+            unresolved[dependent_id] -= 1
+            if unresolved[dependent_id] == 0:
+                ready.append(dependent_id)
+
+    priorities = {}
+    for server_id in server_ids:
+        mask = reachable.get(server_id)
+        if mask is None:
+            priorities[server_id] = calculate_priority_score(server_id, dependency_graph)
+            continue
+
+        priority = 0
+        while mask:
+            lowest = mask & -mask
+            priority += complexity_scores[lowest.bit_length() - 1]
+            mask ^= lowest
+        priorities[server_id] = priority
+
+    return priorities
+
+# Base migration duration by strategy ID
+BASE_DURATIONS = (
+    timedelta(weeks=4),   # Rehost
+    timedelta(weeks=8),   # Replatform
+    timedelta(weeks=12),  # Refactor
+    timedelta(weeks=6)    # Any other strategy
+)
+
+# Duration and effort multipliers by complexity level ID
+COMPLEXITY_MULTIPLIERS = (
+    0.8,  # Low
+    1.0,  # Medium
+    1.5,  # High
+    1.0   # Any other level
+)
+
+def calculate_phase_duration(server: RoadmapServer) -> timedelta:
     """Calculate duration for each migration phase"""
-    base_durations = {
-        'Rehost': timedelta(weeks=4),
-        'Replatform': timedelta(weeks=8),
-        'Refactor': timedelta(weeks=12)
-    }
+    return phase_duration(server.strategy_id, server.level_id, server.dependency_count)
 
+@lru_cache(maxsize=256)
+def phase_duration(strategy_id: int, level_id: int, dependency_count: int) -> timedelta:
+    """Calculate the migration duration for a strategy ID, complexity level ID and dependency count"""
     # Get base duration for strategy
-    base_duration = base_durations.get(
-        server['migrationStrategy']['strategy'],
-        timedelta(weeks=6)
-    )
+    base_duration = BASE_DURATIONS[strategy_id]
 
     # Adjust based on complexity
-    complexity_multipliers = {
-        'Low': 0.8,
-        'Medium': 1.0,
-        'High': 1.5
-    }
-    multiplier = complexity_multipliers.get(server['complexity']['level'], 1.0)
+    multiplier = COMPLEXITY_MULTIPLIERS[level_id]
 
     # Adjust based on number of dependencies
-    dep_count = len(server['serverData']['dependencies'])
-    dependency_factor = 1.0 + (dep_count * 0.1)  # 10% increase per dependency
-
-    return base_duration * multiplier * dependency_factor
-
-def generate_detailed_phases(server, start_date):
-    """Generate detailed migration phases"""
-    strategy = server['migrationStrategy']['strategy']
-    phase_templates = {
-        'Rehost': [
-            ('Planning & Assessment', 0.15, [
-                'Infrastructure assessment',
-                'Dependency mapping',
-                'Migration plan creation',
-                'Risk assessment'
-            ]),
-            ('Environment Preparation', 0.20, [
-                'Target environment setup',
-                'Network configuration',
-                'Security setup',
-                'Monitoring setup'
-            ]),
-            ('Data Migration', 0.25, [
-                'Data transfer planning',
-                'Initial data sync',
-                'Delta sync testing',
-                'Performance optimization'
-            ]),
-            ('Application Migration', 0.25, [
-                'Application installation',
-                'Configuration migration',
-                'Integration testing',
-                'Performance testing'
-            ]),
-            ('Cutover & Validation', 0.15, [
-                'Final data sync',
-                'DNS cutover',
-                'Validation testing',
-                'Performance monitoring'
-            ])
-        ],
-        'Replatform': [
-            ('Analysis & Design', 0.20, [
-                'Current architecture analysis',
-                'Target architecture design',
-                'Gap analysis',
-                'Migration strategy refinement'
-            ]),
-            ('Environment Setup', 0.15, [
-                'Cloud infrastructure setup',
-                'Platform configuration',
-                'Security implementation',
-                'Monitoring setup'
-            ]),
-            ('Application Modification', 0.30, [
-                'Code modifications',
-                'Database optimization',
-                'Integration updates',
-                'Performance tuning'
-            ]),
-            ('Testing', 0.20, [
-                'Unit testing',
-                'Integration testing',
-                'Performance testing',
-                'User acceptance testing'
-            ]),
-            ('Deployment', 0.15, [
-                'Staged rollout',
-                'Data migration',
-                'Production deployment',
-                'Post-deployment validation'
-            ])
-        ],
-        'Refactor': [
-            ('Architecture Design', 0.20, [
-                'Current state analysis',
-                'Future state architecture',
-                'Technology selection',
-                'Implementation planning'
-            ]),
-            ('Development Setup', 0.15, [
-                'Development environment',
-                'CI/CD pipeline setup',
-                'Code repository setup',
-                'Tool configuration'
-            ]),
-            ('Implementation', 0.35, [
-                'Service implementation',
-                'Database migration',
-                'API development',
-                'Integration implementation'
-            ]),
-            ('Testing & QA', 0.20, [
-                'Unit testing',
-                'Integration testing',
-                'Performance testing',
-                'Security testing'
-            ]),
-            ('Production Release', 0.10, [
-                'Production environment setup',
-                'Data migration',
-                'Phased deployment',
-                'Production validation'
-            ])
-        ]
-    }
+    dependency_factor = 1.0 + (dependency_count * 0.1)  # 10% increase per dependency
+
+    # Scale the timedelta once by the combined factor
+    return base_duration * (multiplier * dependency_factor)
+
+# Phases per strategy: (name, share of the total duration, tasks)
+PHASE_TEMPLATES = {
+    'Rehost': (
+        ('Planning & Assessment', 0.15, (
+            'Infrastructure assessment',
+            'Dependency mapping',
+            'Migration plan creation',
+            'Risk assessment'
+        )),
+        ('Environment Preparation', 0.20, (
+            'Target environment setup',
+            'Network configuration',
+            'Security setup',
+            'Monitoring setup'
+        )),
+        ('Data Migration', 0.25, (
+            'Data transfer planning',
+            'Initial data sync',
+            'Delta sync testing',
+            'Performance optimization'
+        )),
+        ('Application Migration', 0.25, (
+            'Application installation',
+            'Configuration migration',
+            'Integration testing',
+            'Performance testing'
+        )),
+        ('Cutover & Validation', 0.15, (
+            'Final data sync',
+            'DNS cutover',
+            'Validation testing',
+            'Performance monitoring'
+        ))
+    ),
+    'Replatform': (
+        ('Analysis & Design', 0.20, (
+            'Current architecture analysis',
+            'Target architecture design',
+            'Gap analysis',
+            'Migration strategy refinement'
+        )),
+        ('Environment Setup', 0.15, (
+            'Cloud infrastructure setup',
+            'Platform configuration',
+            'Security implementation',
+            'Monitoring setup'
+        )),
+        ('Application Modification', 0.30, (
+            'Code modifications',
+            'Database optimization',
+            'Integration updates',
+            'Performance tuning'
+        )),
+        ('Testing', 0.20, (
+            'Unit testing',
+            'Integration testing',
+            'Performance testing',
+            'User acceptance testing'
+        )),
+        ('Deployment', 0.15, (
+            'Staged rollout',
+            'Data migration',
+            'Production deployment',
+            'Post-deployment validation'
+        ))
+    ),
+    'Refactor': (
+        ('Architecture Design', 0.20, (
+            'Current state analysis',
+            'Future state architecture',
+            'Technology selection',
+            'Implementation planning'
+        )),
+        ('Development Setup', 0.15, (
+            'Development environment',
+            'CI/CD pipeline setup',
+            'Code repository setup',
+            'Tool configuration'
+        )),
+        ('Implementation', 0.35, (
+            'Service implementation',
+            'Database migration',
+            'API development',
+            'Integration implementation'
+        )),
+        ('Testing & QA', 0.20, (
+            'Unit testing',
+            'Integration testing',
+            'Performance testing',
+            'Security testing'
+        )),
+        ('Production Release', 0.10, (
+            'Production environment setup',
+            'Data migration',
+            'Phased deployment',
+            'Production validation'
+        ))
+    )
+}
+
+# Phase templates by strategy ID; any other strategy follows the Rehost phases
+PHASE_TEMPLATES_BY_STRATEGY = tuple(PHASE_TEMPLATES[strategy] for strategy in STRATEGIES) + (
+    PHASE_TEMPLATES['Rehost'],
+)
 
+def generate_detailed_phases(server: RoadmapServer, start_date: datetime, total_duration: timedelta) -> List[dict]:
+    """Generate detailed migration phases spanning the server's total duration"""
+    strategy = server.strategy
     phases = []
     current_date = start_date
-    total_duration = calculate_phase_duration(server)
-    phase_template = phase_templates.get(strategy, phase_templates['Rehost'])
+    phase_template = PHASE_TEMPLATES_BY_STRATEGY[server.strategy_id]
 
+    # Each phase starts when the previous one ends, so every date is formatted once
+    start_str = current_date.date().isoformat()
     for phase_name, duration_ratio, tasks in phase_template:
-        phase_duration = timedelta(seconds=total_duration.total_seconds() * duration_ratio)
+        phase_duration = total_duration * duration_ratio
+        current_date += phase_duration
+        end_str = current_date.date().isoformat()
         
         phases.append({
             'name': phase_name,
-            'startDate': current_date.strftime('%Y-%m-%d'),
-            'endDate': (current_date + phase_duration).strftime('%Y-%m-%d'),
-            'duration': str(phase_duration.days) + ' days',
+            'startDate': start_str,
+            'endDate': end_str,
+            'duration': f"{phase_duration.days} days",
             'tasks': tasks,
             'completionCriteria': generate_completion_criteria(phase_name, strategy),
             'risks': generate_risk_assessment(phase_name, strategy, server)
         })
         
-        current_date += phase_duration
+        start_str = end_str
 
     return phases
 
-def generate_completion_criteria(phase_name, strategy):
-    """Generate completion criteria for each phase"""
-    criteria_templates = {
-        'Planning & Assessment': [
-            'Architecture documentation completed and approved',
-            'All dependencies mapped and validated',
-            'Migration plan approved by stakeholders',
-            'Risk mitigation strategies defined'
-        ],
-        'Environment Preparation': [
-            'Target environment fully configured and tested',
-            'Network connectivity validated',
-            'Security controls implemented and verified',
-            'Monitoring tools configured and operational'
-        ],
-        'Data Migration': [
-            'All data successfully migrated and verified',
-            'Data integrity checks passed',
-            'Performance benchmarks met',
-            'Rollback procedures tested'
-        ],
-        'Application Migration': [
-            'All applications successfully migrated',
-            'Integration tests passed',
-            'Performance requirements met',
-            'User acceptance criteria fulfilled'
-        ],
-        'Testing & QA': [
-            'All test cases executed successfully',
-            'Performance criteria met',
-            'Security requirements validated',
-            'Stakeholder sign-off received'
-        ],
-        'Production Release': [
-            'Production environment validated',
-            'All critical functionalities operational',
-            'Monitoring and alerts configured',
-            'Documentation completed'
-        ]
-    }
-    
-    return criteria_templates.get(phase_name, [
-        'Phase objectives achieved',
-        'Quality gates passed',
-        'Stakeholder approval received',
+# Completion criteria per phase name, and for any other phase
+CRITERIA_TEMPLATES = {
+    'Planning & Assessment': (
+        'Architecture documentation completed and approved',
+        'All dependencies mapped and validated',
+        'Migration plan approved by stakeholders',
+        'Risk mitigation strategies defined'
+    ),
+    'Environment Preparation': (
+        'Target environment fully configured and tested',
+        'Network connectivity validated',
+        'Security controls implemented and verified',
+        'Monitoring tools configured and operational'
+    ),
+    'Data Migration': (
+        'All data successfully migrated and verified',
+        'Data integrity checks passed',
+        'Performance benchmarks met',
+        'Rollback procedures tested'
+    ),
+    'Application Migration': (
+        'All applications successfully migrated',
+        'Integration tests passed',
+        'Performance requirements met',
+        'User acceptance criteria fulfilled'
+    ),
+    'Testing & QA': (
+        'All test cases executed successfully',
+        'Performance criteria met',
+        'Security requirements validated',
+        'Stakeholder sign-off received'
+    ),
+    'Production Release': (
+        'Production environment validated',
+        'All critical functionalities operational',
+        'Monitoring and alerts configured',
         'Documentation completed'
-    ])
+    )
+}
 
-def generate_risk_assessment(phase_name, strategy, server):
-    """Generate risk assessment for each phase"""
-    base_risks = {
-        'Planning & Assessment': [
-            'Incomplete dependency mapping',
-            'Underestimated complexity',
-            'Missing critical requirements'
-        ],
-        'Environment Preparation': [
-            'Network connectivity issues',
-            'Security compliance gaps',
-            'Resource availability constraints'
-        ],
-        'Data Migration': [
-            'Data corruption during transfer',
-            'Extended downtime requirements',
-            'Performance degradation'
-        ],
-        'Application Migration': [
-            'Application compatibility issues',
-            'Integration failures',
-            'Performance bottlenecks'
-        ],
-        'Testing & QA': [
-            'Insufficient test coverage',
-            'Undetected critical issues',
-            'User acceptance delays'
-        ],
-        'Production Release': [
-            'Production environment issues',
-            'Rollback complications',
-            'Business continuity risks'
-        ]
-    }
+DEFAULT_COMPLETION_CRITERIA = (
+    'Phase objectives achieved',
+    'Quality gates passed',
+    'Stakeholder approval received',
+    'Documentation completed'
+)
 
-    # Get base risks for the phase
-    risks = base_risks.get(phase_name, ['Standard execution risks'])
+def generate_completion_criteria(phase_name: str, strategy: str) -> Tuple[str, ...]:
+    """Generate completion criteria for each phase"""
+    return CRITERIA_TEMPLATES.get(phase_name, DEFAULT_COMPLETION_CRITERIA)
+
+# Base risks per phase name, and for any other phase
+BASE_RISKS = {
+    'Planning & Assessment': (
+        'Incomplete dependency mapping',
+        'Underestimated complexity',
+        'Missing critical requirements'
+    ),
+    'Environment Preparation': (
+        'Network connectivity issues',
+        'Security compliance gaps',
+        'Resource availability constraints'
+    ),
+    'Data Migration': (
+        'Data corruption during transfer',
+        'Extended downtime requirements',
+        'Performance degradation'
+    ),
+    'Application Migration': (
+        'Application compatibility issues',
+        'Integration failures',
+        'Performance bottlenecks'
+    ),
+    'Testing & QA': (
+        'Insufficient test coverage',
+        'Undetected critical issues',
+        'User acceptance delays'
+    ),
+    'Production Release': (
+        'Production environment issues',
+        'Rollback complications',
+        'Business continuity risks'
+    )
+}
+
+DEFAULT_RISKS = ('Standard execution risks',)
+
+def generate_risk_assessment(phase_name: str, strategy: str, server: RoadmapServer) -> List[str]:
+    """Generate risk assessment for each phase"""
+    # Get base risks for the phase, copied before server-specific risks are appended
+    risks = list(BASE_RISKS.get(phase_name, DEFAULT_RISKS))
 
     # Add complexity-based risks
-    if server['complexity']['level'] == 'High':
+    if server.level_id == HIGH_LEVEL:
         risks.append('High complexity mitigation required')
         risks.append('Extended timeline risk')
     
     # Add dependency-based risks
-    if len(server['serverData']['dependencies']) > 2:
+    if server.dependency_count > 2:
         risks.append('Multiple dependency coordination required')
     
     return risks
 
-def calculate_effort(server):
+# Base effort in person-hours by strategy ID
+BASE_EFFORT = (
+    160,  # Rehost: 4 weeks, 1 person
+    480,  # Replatform: 12 weeks, 1 person
+    960,  # Refactor: 24 weeks, 1 person
+    320   # Any other strategy
+)
+
+def calculate_effort(server: RoadmapServer) -> int:
     """Calculate estimated effort in person-hours"""
-    base_effort = {
-        'Rehost': 160,      # 4 weeks, 1 person
-        'Replatform': 480,  # 12 weeks, 1 person
-        'Refactor': 960     # 24 weeks, 1 person
-    }
-
-    strategy = server['migrationStrategy']['strategy']
-    base = base_effort.get(strategy, 320)
+    base = BASE_EFFORT[server.strategy_id]
     
     # Adjust for complexity
-    complexity_multipliers = {
-        'Low': 0.8,
-        'Medium': 1.0,
-        'High': 1.5
-    }
-    
-    multiplier = complexity_multipliers.get(server['complexity']['level'], 1.0)
+    multiplier = COMPLEXITY_MULTIPLIERS[server.level_id]
     
     # Adjust for dependencies
-    dependency_factor = 1 + (len(server['serverData']['dependencies']) * 0.15)
+    dependency_factor = 1 + (server.dependency_count * 0.15)
     
     return round(base * multiplier * dependency_factor)
 
-def is_critical_path(server, all_servers):
+def count_dependents(servers: List[RoadmapServer]) -> Counter:
+    """Count how many servers depend on each server ID"""
+    dependent_counts = Counter()
+    for server in servers:
+        dependent_counts.update(set(server.dependencies))
+    return dependent_counts
+
+def is_critical_path(server: RoadmapServer, dependent_counts: Counter) -> bool:
     """Determine if server is on critical path"""
     # Server is on critical path if:
     # 1. It has many dependents
     # 2. It's high complexity
     # 3. It has high resource utilization
     
-    dependent_count = sum(
-        1 for s in all_servers 
-        if server['serverData']['serverId'] in s['serverData']['dependencies']
-    )
-    
     is_critical = (
-        dependent_count >= 2 or
-        server['complexity']['level'] == 'High' or
-        server['serverData']['metrics']['cpu']['utilization'] > 80
+        dependent_counts[server.server_id] >= 2 or
+        server.level_id == HIGH_LEVEL or
+        server.cpu_utilization > 80
     )
     
     return is_critical
 
-def lambda_handler(event, context):
+def lambda_handler(event: dict, context: Any) -> dict:
     try:
         # Parse input data
-        input_data = json.loads(event['body'])
+        input_data = json_loads(event['body'])
         servers = input_data.get('servers', [])
         
-        # Generate migration timeline
-        timeline = generate_timeline(servers)
-        
-        # Calculate overall project metrics
-        start_date = datetime.strptime(timeline[0]['startDate'], '%Y-%m-%d')
-        end_date = datetime.strptime(timeline[-1]['endDate'], '%Y-%m-%d')
+        # Generate migration timeline, keeping its start and end datetimes
+        start_date = datetime.now()
+        timeline, end_date = schedule_timeline(servers, start_date)
         
+        # Count strategies and complexity levels in a single pass over the servers
+        strategy_counts = Counter()
+        level_counts = Counter()
+        for server in servers:
+            strategy_counts[server['migrationStrategy']['strategy']] += 1
+            level_counts[server['complexity']['level']] += 1
+
+        # Collect critical servers, total effort and key milestones in a single
+        # pass over the timeline
+        critical_path = []
+        total_effort = 0
+        milestones = [
+            {
+                'name': 'Project Kickoff',
+                'date': timeline[0]['startDate'],
+                'description': 'Project initiation and team onboarding'
+            }
+        ]
+        for server in timeline:
+            total_effort += server['estimatedEffort']
+            if server['criticalPath']:
+                server_name = server['serverName']
+                critical_path.append(server_name)
+                milestones.append({
+                    'name': f"{server_name} Migration",
+                    'date': server['startDate'],
+                    'description': f"Begin migration of critical server {server_name}"
+                })
+                milestones.append({
+                    'name': f"{server_name} Completion",
+                    'date': server['endDate'],
+                    'description': f"Complete migration of critical server {server_name}"
+                })
+        milestones.append({
+            'name': 'Project Completion',
+            'date': timeline[-1]['endDate'],
+            'description': 'All migration activities completed'
+        })
+
         # Generate project summary
         project_summary = {
             'startDate': timeline[0]['startDate'],
             'endDate': timeline[-1]['endDate'],
-            'duration': str(end_date - start_date),
+            'duration': str(end_date.date() - start_date.date()),
             'totalServers': len(servers),
             'strategyBreakdown': {
-                strategy: len([s for s in servers if s['migrationStrategy']['strategy'] == strategy])
+                strategy: strategy_counts[strategy]
                 for strategy in ['Rehost', 'Replatform', 'Refactor']
             },
             'riskProfile': {
-                'high': len([s for s in servers if s['complexity']['level'] == 'High']),
-                'medium': len([s for s in servers if s['complexity']['level'] == 'Medium']),
-                'low': len([s for s in servers if s['complexity']['level'] == 'Low'])
+                'high': level_counts['High'],
+                'medium': level_counts['Medium'],
+                'low': level_counts['Low']
             },
-            'criticalPath': [
-                server['serverName'] for server in timeline 
-                if is_critical_path(server, servers)
-            ],
-            'totalEffort': sum(server['estimatedEffort'] for server in timeline),
-            'keyMilestones': generate_key_milestones(timeline)
+            'criticalPath': critical_path,
+            'totalEffort': total_effort,
+            'keyMilestones': milestones
         }
         
         response_data = {
@@ -446,7 +622,7 @@ def lambda_handler(event, context):
         
         return {
             'statusCode': 200,
-            'body': json.dumps(response_data),
+            'body': json_dumps(response_data),
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
@@ -456,7 +632,7 @@ def lambda_handler(event, context):
     except Exception as e:
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': json_dumps({
                 'error': str(e)
             }),
             'headers': {
@@ -464,36 +640,3 @@ def lambda_handler(event, context):
                 'Access-Control-Allow-Origin': '*'
             }
         }
-
-def generate_key_milestones(timeline):
-    """Generate key project milestones"""
-    milestones = [
-        {
-            'name': 'Project Kickoff',
-            'date': timeline[0]['startDate'],
-            'description': 'Project initiation and team onboarding'
-        }
-    ]
-    
-    # Add critical server migrations
-    for server in timeline:
-        if server.get('criticalPath'):
-            milestones.append({
-                'name': f"{server['serverName']} Migration",
-                'date': server['startDate'],
-                'description': f"Begin migration of critical server {server['serverName']}"
-            })
-            milestones.append({
-                'name': f"{server['serverName']} Completion",
-                'date': server['endDate'],
-                'description': f"Complete migration of critical server {server['serverName']}"
-            })
-    
-    # Add project completion
-    milestones.append({
-        'name': 'Project Completion',
-        'date': timeline[-1]['endDate'],
-        'description': 'All migration activities completed'
-    })
-    
-    return milestones
\ No newline at end of file
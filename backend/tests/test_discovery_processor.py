@@ -0,0 +1,175 @@
+import importlib.util
+import json
+import os
+import unittest
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('DISCOVERY_TABLE', 'migration-assessments-test')
+
+# The Lambda sources live in backend/lambda/<name>/index.py, which cannot be
+# imported by package name, so load the module straight from its file
+INDEX_PATH = os.path.join(
+    os.path.dirname(__file__), os.pardir, 'lambda', 'discoveryProcessor', 'index.py'
+)
+spec = importlib.util.spec_from_file_location('discovery_processor', INDEX_PATH)
+discovery = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(discovery)
+
+def make_server(index, **overrides):
+    """Build a well-formed raw server whose metrics vary with index"""
+    server = {
+        'serverId': f'server-{index}',
+        'serverName': f'Server {index}',
+        'cpuCores': 4,
+        'cpuUtilization': (index * 7) % 100,
+        'totalMemory': 16384,
+        'usedMemory': (index * 1237) % 16384,
+        'totalStorage': 512000,
+        'usedStorage': (index * 40961) % 512000,
+        'applications': ['app'] * (index % 8),
+        'dependencies': ['dep'] * (index % 7),
+        'networkUtilization': {'averageUsage': (index * 13) % 100}
+    }
+    server.update(overrides)
+    return server
+
+class NumericCoercionTest(unittest.TestCase):
+    def test_numeric_strings_are_scored_like_numbers(self):
+        numeric = discovery.assess_server(make_server(1, cpuUtilization=95, totalMemory=1000, usedMemory=900))
+        strings = discovery.assess_server(make_server(1, cpuUtilization='95', totalMemory='1000', usedMemory='900'))
+
+        self.assertIsNotNone(strings)
+        self.assertEqual(strings['complexity'], numeric['complexity'])
+        self.assertEqual(strings['complexity']['factors']['cpu'], 95.0)
+
+    def test_non_numeric_metrics_are_skipped(self):
+        self.assertIsNone(discovery.assess_server(make_server(1, cpuUtilization=None)))
+        self.assertIsNone(discovery.assess_server(make_server(1, usedMemory='lots')))
+
+# Servers the vectorized path must not score differently from assess_server
+MALFORMED_SERVERS = [
+    make_server(100, usedMemory=None),
+    make_server(101, cpuUtilization=None),
+    make_server(102, cpuUtilization='95'),
+    make_server(103, totalMemory='16384', usedMemory='15000'),
+    make_server(104, totalStorage='lots'),
+    make_server(105, cpuUtilization=True),
+    make_server(106, usedStorage=float('nan')),
+    make_server(107, networkUtilization={'averageUsage': None}),
+    make_server(108, networkUtilization={'averageUsage': '90'}),
+    make_server(109, networkUtilization='busy'),
+    make_server(110, totalMemory=0, totalStorage=0),
+    make_server(111, cpuUtilization=65.5, usedMemory=8192.5)
+]
+
+def comparable(assessments):
+    """Drop the per-call timestamps and render the assessments for comparison"""
+    return [
+        json.dumps({**assessment, 'timestamp': None}, sort_keys=True)
+        for assessment in assessments
+    ]
+
+@unittest.skipUnless(discovery.load_numpy(), 'NumPy is not installed')
+class FleetParityTest(unittest.TestCase):
+    def assert_fleet_matches_servers(self, servers):
+        expected = [discovery.assess_server(server) for server in servers]
+        expected = [assessment for assessment in expected if assessment is not None]
+        self.assertEqual(comparable(discovery.assess_fleet(servers)), comparable(expected))
+
+    def test_well_formed_fleet(self):
+        self.assert_fleet_matches_servers([make_server(index) for index in range(64)])
+
+    def test_fleet_with_malformed_servers(self):
+        servers = [make_server(index) for index in range(40)]
+        for offset, server in enumerate(MALFORMED_SERVERS):
+            servers.insert(offset * 3, server)
+        self.assert_fleet_matches_servers(servers)
+
+    def test_fleet_of_only_malformed_servers(self):
+        self.assert_fleet_matches_servers(MALFORMED_SERVERS)
+
+class FakeDynamoDBClient:
+    """Stands in for the DynamoDB client, rejecting non-string keys like the real table"""
+
+    def __init__(self, unprocessed_rounds=0):
+        self.stored = []
+        self.batch_calls = 0
+        self.unprocessed_rounds = unprocessed_rounds
+
+    def check_key(self, item, operation):
+        if set(item['serverId']) != {'S'}:
+            raise ClientError(
+                {'Error': {'Code': 'ValidationException', 'Message': 'Invalid key type'}},
+                operation
+            )
+
+    def batch_write_item(self, RequestItems):
+        self.batch_calls += 1
+        requests = RequestItems[discovery.TABLE_NAME]
+        for request in requests:
+            self.check_key(request['PutRequest']['Item'], 'BatchWriteItem')
+        if self.unprocessed_rounds:
+            # Throttle the first request of the batch
+            self.unprocessed_rounds -= 1
+            requests, unprocessed = requests[1:], {discovery.TABLE_NAME: requests[:1]}
+        else:
+            unprocessed = {}
+        self.stored.extend(request['PutRequest']['Item']['serverId']['S'] for request in requests)
+        return {'UnprocessedItems': unprocessed}
+
+    def put_item(self, TableName, Item):
+        self.check_key(Item, 'PutItem')
+        self.stored.append(Item['serverId']['S'])
+
+class HandlerWriteTest(unittest.TestCase):
+    def invoke(self, servers, client):
+        with mock.patch.object(discovery, 'dynamodb_client', client), \
+                mock.patch.object(discovery.time, 'sleep') as sleep:
+            response = discovery.lambda_handler({'body': json.dumps({'servers': servers})}, None)
+        return response, json.loads(response['body']), sleep
+
+    def test_unstorable_servers_do_not_fail_the_request(self):
+        servers = [make_server(index) for index in range(40)]
+        del servers[3]['serverId']
+        servers[7]['usedStorage'] = float('nan')
+        servers[30]['serverId'] = 30
+        client = FakeDynamoDBClient()
+
+        # Only the standard library parser accepts the NaN literal in the body
+        with mock.patch.object(discovery, 'orjson', None):
+            response, body, _ = self.invoke(servers, client)
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(len(body['servers']), 40)
+        self.assertEqual(len(client.stored), 37)
+        self.assertNotIn('server-7', client.stored)
+
+    def test_unprocessed_items_are_resent_with_backoff(self):
+        client = FakeDynamoDBClient(unprocessed_rounds=3)
+
+        response, _, sleep = self.invoke([make_server(index) for index in range(10)], client)
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(sorted(client.stored), sorted(f'server-{index}' for index in range(10)))
+        self.assertEqual(client.batch_calls, 4)
+        self.assertEqual(sleep.call_count, 3)
+
+    def test_rejected_batch_is_written_item_by_item(self):
+        servers = [make_server(index) for index in range(5)]
+        client = FakeDynamoDBClient()
+        items = [
+            discovery.serialize_item({'serverId': server['serverId'], 'timestamp': 't'})
+            for server in servers
+        ]
+        items[2]['serverId'] = {'NULL': True}
+
+        with mock.patch.object(discovery, 'dynamodb_client', client):
+            discovery.batch_write_items(items)
+
+        self.assertEqual(client.stored, ['server-0', 'server-1', 'server-3', 'server-4'])
+
+if __name__ == '__main__':
+    unittest.main()
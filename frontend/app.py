@@ -1,13 +1,21 @@
 from flask import Flask, render_template, request, jsonify
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+# Configure logging; set LOG_LEVEL to quieten it in production
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'DEBUG').upper())
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
@@ -16,6 +24,61 @@ app = Flask(__name__)
 load_dotenv()
 API_GATEWAY_URL = os.getenv('API_GATEWAY_URL')
 
+# Cost estimates are requested in parallel over one pooled, keep-alive session
+MAX_ESTIMATE_WORKERS = 16
+session = requests.Session()
+
+# Failed connections are retried for every endpoint, since nothing was sent.
+# Gateway errors are only retried for the estimate and roadmap endpoints, which
+# are pure computations; /analyze writes assessments and must not be repeated.
+adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2)
+)
+idempotent_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'POST'}),
+        raise_on_status=False
+    )
+)
+session.mount('https://', adapter)
+session.mount('http://', adapter)
+session.mount(f"{API_GATEWAY_URL}/estimate", idempotent_adapter)
+session.mount(f"{API_GATEWAY_URL}/roadmap", idempotent_adapter)
+
+def json_loads(data):
+    """Parse JSON bytes, using orjson when it is available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(obj):
+    """Serialize obj to JSON bytes, using orjson when it is available"""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+def estimate_cost(server):
+    """Request the cost estimate for one analyzed server"""
+    return session.post(
+        f"{API_GATEWAY_URL}/estimate",
+        json={
+            'serverData': server['serverData'],
+            'migrationStrategy': server['migrationStrategy']
+        },
+        headers={'Content-Type': 'application/json'}
+    )
+
+def generate_roadmap(body):
+    """Request the migration roadmap for an already serialized analysis result"""
+    return session.post(
+        f"{API_GATEWAY_URL}/roadmap",
+        data=body,
+        headers={'Content-Type': 'application/json'}
+    )
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -27,44 +90,41 @@ def analyze():
         if not file:
             return jsonify({'error': 'No file provided'}), 400
 
-        # Read and parse JSON data
-        data = json.loads(file.read())
-        logger.debug(f"Input data: {json.dumps(data, indent=2)}")
+        # Read the upload once from the underlying stream and parse it to
+        # validate it; the raw bytes are forwarded as-is rather than re-encoded
+        body = file.stream.read()
+        json_loads(body)
+        logger.debug("Input size: %d bytes", len(body))
         
         # Call API Gateway endpoint
-        response = requests.post(
+        response = session.post(
             f"{API_GATEWAY_URL}/analyze",
-            json=data,
+            data=body,
             headers={'Content-Type': 'application/json'}
         )
         
-        logger.debug(f"API Response status: {response.status_code}")
-        logger.debug(f"API Response: {response.text}")
+        # Log lazily and without decoding the body, which may be large
+        logger.debug("API Response status: %s", response.status_code)
+        logger.debug("API Response size: %d bytes", len(response.content))
         
         if response.status_code != 200:
             return jsonify({'error': f'Analysis failed: {response.text}'}), 500
             
         analysis_result = response.json()
         
-        # Call cost estimation
-        for server in analysis_result['servers']:
-            cost_response = requests.post(
-                f"{API_GATEWAY_URL}/estimate",
-                json={
-                    'serverData': server['serverData'],
-                    'migrationStrategy': server['migrationStrategy']
-                },
-                headers={'Content-Type': 'application/json'}
-            )
-            if cost_response.status_code == 200:
-                server['costAnalysis'] = cost_response.json()
+        # The roadmap does not depend on cost estimates, so request it alongside
+        # them. Its body is serialized up front, before cost analyses are attached.
+        servers = analysis_result['servers']
+        with ThreadPoolExecutor(max_workers=MAX_ESTIMATE_WORKERS) as executor:
+            roadmap_future = executor.submit(generate_roadmap, json_dumps(analysis_result))
+            
+            # Call cost estimation for all servers in parallel
+            for server, cost_response in zip(servers, executor.map(estimate_cost, servers)):
+                if cost_response.status_code == 200:
+                    server['costAnalysis'] = cost_response.json()
+            
+            roadmap_response = roadmap_future.result()
         
-        # Call roadmap generation
-        roadmap_response = requests.post(
-            f"{API_GATEWAY_URL}/roadmap",
-            json=analysis_result,
-            headers={'Content-Type': 'application/json'}
-        )
         if roadmap_response.status_code == 200:
             analysis_result['roadmap'] = roadmap_response.json()
         